@@ -0,0 +1,177 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import authentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from accounts.hashers import acheck_password, amake_password
+from helpers.cache import LRUCache
+
+
+class UserRecordCache:
+    """
+    Cache LRU du processus des enregistrements d'utilisateurs (toutes les colonnes sauf le mot de passe),
+    par valeur de USER_ID_FIELD. Chaque requête reçoit sa propre instance CustomUser construite depuis le cache.
+    Invalidé à l'enregistrement et à la suppression d'un CustomUser (accounts.signals).
+    """
+
+    excluded_fields = ('password',)
+
+    def __init__(self, max_entries=10000, timeout=300):
+        self.local = LRUCache(max_entries=max_entries, timeout=timeout)
+
+    @classmethod
+    def from_settings(cls):
+        options = getattr(settings, 'TOKEN_USER_CACHE', {})
+        return cls(max_entries=options.get('MAX_ENTRIES', 10000), timeout=options.get('TIMEOUT', 300))
+
+    @property
+    def user_model(self):
+        return get_user_model()
+
+    @property
+    def field_names(self):
+        return [
+            field.attname for field in self.user_model._meta.concrete_fields
+            if field.attname not in self.excluded_fields
+        ]
+
+    def queryset(self, user_id):
+        # Lu sur la base principale : une réplique en retard resterait en cache.
+        manager = self.user_model._default_manager.db_manager(router.db_for_write(self.user_model))
+        return manager.filter(**{api_settings.USER_ID_FIELD: user_id})
+
+    def build(self, record):
+        """Instance CustomUser non modifiée depuis la base (mot de passe chargé à la demande)."""
+        if record is None:
+            return None
+        db, values = record
+        return self.user_model.from_db(db, self.field_names, values)
+
+    def get_user(self, user_id):
+        """Retourne l'utilisateur (None s'il n'existe pas), lu en base une seule fois tant qu'il est en cache."""
+        key = str(user_id)
+        record = self.local.get(key)
+        if record is None:
+            queryset = self.queryset(user_id)
+            values = queryset.values_list(*self.field_names).first()
+            if values is None:
+                return None
+            record = (queryset.db, values)
+            self.local.set(key, record)
+        return self.build(record)
+
+    async def aget_user(self, user_id):
+        """Version asynchrone de get_user (ORM asynchrone)."""
+        key = str(user_id)
+        record = self.local.get(key)
+        if record is None:
+            queryset = self.queryset(user_id)
+            values = await queryset.values_list(*self.field_names).afirst()
+            if values is None:
+                return None
+            record = (queryset.db, values)
+            self.local.set(key, record)
+        return self.build(record)
+
+    def invalidate(self, user_id):
+        self.local.delete(str(user_id))
+
+    def clear(self):
+        self.local.clear()
+
+
+user_cache = UserRecordCache.from_settings()
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+    """
+    JWTAuthentication de simplejwt, avec une version asynchrone (aauthenticate)
+    utilisée par les vues asynchrones : l'utilisateur est chargé par l'ORM asynchrone.
+    """
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    def get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    def check_user(self, user):
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
+
+    async def aget_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        user = await self.user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).afirst()
+        return self.check_user(user)
+
+
+def get_token_user_id(request):
+    """Identifiant d'utilisateur du jeton JWT valide de la requête (None sans jeton ou si le jeton est invalide)."""
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    try:
+        raw_token = authentication.get_raw_token(header)
+        if raw_token is None:
+            return None
+        return authentication.get_user_id(authentication.get_validated_token(raw_token))
+    except AuthenticationFailed:
+        return None
+
+
+class TokenUserAuthentication(JWTAuthentication):
+    """
+    Authentification JWT sans lecture de l'utilisateur à chaque requête : l'identifiant signé du jeton
+    (USER_ID_CLAIM) désigne l'enregistrement conservé par user_cache (settings TOKEN_USER_CACHE).
+    request.user reste une instance CustomUser (clés étrangères, is_contributor, permissions des projets).
+    """
+
+    def get_user(self, validated_token):
+        return self.check_user(user_cache.get_user(self.get_user_id(validated_token)))
+
+    async def aget_user(self, validated_token):
+        return self.check_user(await user_cache.aget_user(self.get_user_id(validated_token)))
+
+
+async def aauthenticate_credentials(email, password):
+    """
+    Version asynchrone de ModelBackend.authenticate (backend d'authentification du projet) : le mot de passe
+    est vérifié, et rehaché si ses paramètres ont changé, dans le pool borné de accounts.hashers.
+    Retourne l'utilisateur actif correspondant, None sinon.
+    """
+    user_model = get_user_model()
+    try:
+        user = await user_model._default_manager.aget(**{user_model.USERNAME_FIELD: email})
+    except user_model.DoesNotExist:
+        # Hachage du mot de passe même sans utilisateur, comme ModelBackend (durée de réponse comparable).
+        await amake_password(password)
+        return None
+
+    async def setter(raw_password):
+        user.password = await amake_password(raw_password)
+        await user.asave(update_fields=['password'])
+
+    if await acheck_password(password, user.password, setter) and user.is_active:
+        return user
+    return None
@@ -0,0 +1,86 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+logger = logging.getLogger('token_compaction')
+
+CompactionReport = namedtuple('CompactionReport', ('outstanding', 'blacklisted', 'batches', 'duration'))
+
+_sweeper = None
+_sweeper_lock = threading.Lock()
+
+
+def get_compaction_options():
+    options = {'SWEEP_INTERVAL': None, 'BATCH_SIZE': 1000, 'MAX_BATCHES': None}
+    options.update(getattr(settings, 'TOKEN_COMPACTION', {}))
+    return options
+
+
+def expired_tokens(now):
+    """Jetons en attente expirés, lus dans l'ordre de l'index sur expires_at."""
+    return OutstandingToken.objects.filter(expires_at__lte=now).order_by('expires_at')
+
+
+def compact_tokens(batch_size=1000, max_batches=None, now=None):
+    """
+    Supprime les jetons en attente expirés et leurs révocations (BlacklistedToken) par lots de batch_size,
+    chaque lot dans sa propre transaction courte. Retourne le nombre de lignes supprimées et la durée.
+    """
+    start = time.perf_counter()
+    now = now or aware_utcnow()
+    outstanding = blacklisted = batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = list(expired_tokens(now).values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        deleted, per_model = OutstandingToken.objects.filter(id__in=ids).delete()
+        outstanding += per_model.get('token_blacklist.OutstandingToken', 0)
+        blacklisted += per_model.get('token_blacklist.BlacklistedToken', 0)
+        batches += 1
+    return CompactionReport(outstanding, blacklisted, batches, time.perf_counter() - start)
+
+
+class TokenSweeper(threading.Thread):
+    """Compaction périodique des jetons dans le processus (settings TOKEN_COMPACTION['SWEEP_INTERVAL'])."""
+
+    def __init__(self, interval, batch_size, max_batches):
+        super().__init__(name='token-sweeper', daemon=True)
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                report = compact_tokens(self.batch_size, self.max_batches)
+                logger.info(
+                    "Jetons compactés : %d en attente, %d révoqués, %d lots, %.3f s",
+                    report.outstanding, report.blacklisted, report.batches, report.duration,
+                )
+            except DatabaseError:
+                logger.exception("Échec de la compaction des jetons.")
+            finally:
+                connections.close_all()
+
+    def stop(self):
+        self.stopped.set()
+
+
+def start_sweeper():
+    """Démarre le balayage périodique une seule fois par processus, si SWEEP_INTERVAL est défini."""
+    global _sweeper
+    options = get_compaction_options()
+    if not options['SWEEP_INTERVAL']:
+        return None
+    with _sweeper_lock:
+        if _sweeper is None:
+            _sweeper = TokenSweeper(options['SWEEP_INTERVAL'], options['BATCH_SIZE'], options['MAX_BATCHES'])
+            _sweeper.start()
+    return _sweeper
@@ -0,0 +1,118 @@
+import asyncio
+import base64
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher, check_password, get_hasher, identify_hasher, is_password_usable, make_password
+)
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.crypto import constant_time_compare, pbkdf2
+
+# Nombre d'itérations PBKDF2 par profil ; 'fast' est réservé aux tests et aux jeux de données générés.
+HASHER_PROFILES = {
+    'standard': PBKDF2PasswordHasher.iterations,
+    'strong': 2 * PBKDF2PasswordHasher.iterations,
+    'fast': 1000,
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_hashing_options():
+    return getattr(settings, 'PASSWORD_HASHING', {})
+
+
+def get_hashing_executor():
+    """Pool borné (thread ou processus) exécutant les hachages des vues asynchrones, créé à la première utilisation."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                options = get_hashing_options()
+                max_workers = options.get('MAX_WORKERS') or os.cpu_count() or 1
+                executor_class = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}.get(
+                    options.get('EXECUTOR', 'thread')
+                )
+                if executor_class is None:
+                    raise ImproperlyConfigured("PASSWORD_HASHING['EXECUTOR'] : 'thread' ou 'process'.")
+                _executor = executor_class(max_workers=max_workers)
+    return _executor
+
+
+class ProfilePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2PasswordHasher (même algorithme pbkdf2_sha256) dont le nombre d'itérations suit le profil
+    de settings PASSWORD_HASHING : un mot de passe haché avec d'autres paramètres est rehaché à la connexion
+    (must_update). encode et verify calculent dans le thread appelant (vues synchrones, WSGI) ;
+    aencode et averify attendent le pool borné sans occuper le thread de la boucle (vues asynchrones, ASGI).
+    """
+
+    @property
+    def iterations(self):
+        options = get_hashing_options()
+        if options.get('ITERATIONS'):
+            return options['ITERATIONS']
+        profile = options.get('PROFILE', 'standard')
+        try:
+            return HASHER_PROFILES[profile]
+        except KeyError:
+            raise ImproperlyConfigured(f"PASSWORD_HASHING['PROFILE'] inconnu : {profile}.")
+
+    async def aencode(self, password, salt, iterations=None):
+        self._check_encode_args(password, salt)
+        iterations = iterations or self.iterations
+        hash = await asyncio.wrap_future(
+            get_hashing_executor().submit(pbkdf2, password, salt, iterations, digest=self.digest)
+        )
+        hash = base64.b64encode(hash).decode("ascii").strip()
+        return "%s$%d$%s$%s" % (self.algorithm, iterations, salt, hash)
+
+    async def averify(self, password, encoded):
+        decoded = self.decode(encoded)
+        encoded_2 = await self.aencode(password, decoded["salt"], decoded["iterations"])
+        return constant_time_compare(encoded, encoded_2)
+
+    async def aharden_runtime(self, password, encoded):
+        decoded = self.decode(encoded)
+        extra_iterations = self.iterations - decoded["iterations"]
+        if extra_iterations > 0:
+            await self.aencode(password, decoded["salt"], extra_iterations)
+
+
+async def amake_password(password):
+    """make_password dont le hachage pbkdf2_sha256 est attendu dans le pool borné."""
+    hasher = get_hasher('default')
+    if password is None or not isinstance(hasher, ProfilePBKDF2PasswordHasher):
+        return await sync_to_async(make_password)(password)
+    return await hasher.aencode(password, hasher.salt())
+
+
+async def acheck_password(password, encoded, setter=None):
+    """
+    check_password dont la vérification pbkdf2_sha256 est attendue dans le pool borné
+    (autres algorithmes : check_password dans un thread). setter est une coroutine, appelée pour rehacher
+    un mot de passe correct haché avec d'autres paramètres.
+    """
+    if password is None or not is_password_usable(encoded):
+        return False
+    preferred = get_hasher('default')
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    hasher_changed = hasher.algorithm != preferred.algorithm
+    must_update = hasher_changed or preferred.must_update(encoded)
+    if not isinstance(hasher, ProfilePBKDF2PasswordHasher):
+        is_correct = await sync_to_async(check_password)(password, encoded)
+    else:
+        is_correct = await hasher.averify(password, encoded)
+        if not is_correct and not hasher_changed and must_update:
+            await hasher.aharden_runtime(password, encoded)
+    if setter and is_correct and must_update:
+        await setter(password)
+    return is_correct
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from accounts.compaction import compact_tokens, get_compaction_options
+
+
+class Command(BaseCommand):
+    help = (
+        "Supprime par lots les jetons JWT en attente expirés (OutstandingToken) et leurs révocations "
+        "(BlacklistedToken), puis affiche le nombre de lignes supprimées et la durée."
+    )
+
+    def add_arguments(self, parser):
+        options = get_compaction_options()
+        parser.add_argument('--batch-size', type=int, default=options['BATCH_SIZE'])
+        parser.add_argument('--max-batches', type=int, default=options['MAX_BATCHES'],
+                            help="Nombre maximal de lots (sans limite par défaut).")
+
+    def handle(self, *args, **options):
+        report = compact_tokens(options['batch_size'], options['max_batches'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{report.outstanding} jetons en attente et {report.blacklisted} jetons révoqués supprimés "
+            f"en {report.batches} lots ({report.duration:.3f} s)."
+        ))
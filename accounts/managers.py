@@ -1,4 +1,3 @@
-from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import UserManager
 from django.utils.translation import gettext_lazy as _
 
@@ -6,7 +5,8 @@ from django.utils.translation import gettext_lazy as _
 class CustomUserManager(UserManager):
     """Gestionnaire personnalisé utilisant l'email comme identifiant unique."""
 
-    def create_user(self, email, last_name, first_name, password, **extra_fields):
+    def create_user(self, email, last_name, first_name, password, encoded_password=None, **extra_fields):
+        """encoded_password : mot de passe déjà haché (inscription asynchrone), enregistré sans nouveau hachage."""
         if not email:
             raise ValueError(_("L'email est obligatoire"))
         if not first_name:
@@ -15,8 +15,10 @@ class CustomUserManager(UserManager):
             raise ValueError(_("Le nom est obligatoire"))
         email = self.normalize_email(email)
         user = self.model(email=email, last_name=last_name, first_name=first_name, **extra_fields)
-        user.password = make_password(password)
-        user.set_password(password)
+        if encoded_password is not None:
+            user.password = encoded_password
+        else:
+            user.set_password(password)
         user.save(using=self._db)
         return user
 
@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+# Index de la table de rest_framework_simplejwt.token_blacklist : créé par le schema_editor sans modifier
+# l'état des modèles de l'application tierce (aucune migration générée de son côté).
+EXPIRES_AT_INDEX = models.Index(fields=['expires_at'], name='outstandingtoken_expires_idx')
+
+
+def add_expires_at_index(apps, schema_editor):
+    schema_editor.add_index(apps.get_model('token_blacklist', 'OutstandingToken'), EXPIRES_AT_INDEX)
+
+
+def remove_expires_at_index(apps, schema_editor):
+    schema_editor.remove_index(apps.get_model('token_blacklist', 'OutstandingToken'), EXPIRES_AT_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('token_blacklist', '0012_alter_outstandingtoken_user'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_expires_at_index, remove_expires_at_index),
+    ]
@@ -48,6 +48,4 @@ class CustomUser(PermissionsMixin, AbstractBaseUser):
         return self.email
 
     def is_contributor(self, project):
-        if project in self.project_contributors.all():
-            return True
-        return False
+        return self.project_contributors.filter(pk=project.pk).exists()
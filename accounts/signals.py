@@ -0,0 +1,18 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+
+from accounts.authentication import user_cache
+from helpers.cache import invalidate_on_commit
+
+CustomUser = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Invalide l'utilisateur mis en cache par l'authentification JWT lors de sa modification ou suppression,
+    de nouveau après la validation de la transaction.
+    """
+    invalidate_on_commit(user_cache.invalidate, getattr(instance, api_settings.USER_ID_FIELD))
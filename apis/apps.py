@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ApisConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apis'
+
+    def ready(self):
+        from helpers import sqlite  # noqa: F401
+        from helpers.routing import start_syncer
+        start_syncer()
@@ -0,0 +1,59 @@
+from asgiref.sync import sync_to_async
+from django.urls import path
+
+from . import urls
+from .async_views import (
+    AsyncSignupAPIView,
+    AsyncLoginAPIView,
+    AsyncProjectListAPIView,
+    AsyncProjectDetailAPIView,
+    AsyncContributorsAPIView,
+    AsyncIssuesAPIView,
+    AsyncCommentsAPIView
+)
+
+ASYNC_READ_VIEWS = {
+    'projects': AsyncProjectListAPIView,
+    'project_detail': AsyncProjectDetailAPIView,
+    'contributors': AsyncContributorsAPIView,
+    'issues': AsyncIssuesAPIView,
+    'comments': AsyncCommentsAPIView,
+}
+
+# Routes servies entièrement par une vue asynchrone : les hachages des mots de passe sont attendus
+# dans le pool borné de accounts.hashers sans occuper de thread.
+ASYNC_VIEWS = {
+    'signup': AsyncSignupAPIView,
+    'login': AsyncLoginAPIView,
+}
+
+
+def read_write_view(async_view, sync_view):
+    """Vue ASGI : GET et HEAD par la vue asynchrone, autres méthodes par la vue synchrone (dans un thread)."""
+    sync_view = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        if request.method in ('GET', 'HEAD'):
+            return await async_view(request, *args, **kwargs)
+        return await sync_view(request, *args, **kwargs)
+
+    view.csrf_exempt = True
+    return view
+
+
+def async_pattern(pattern):
+    """Route de apis/urls.py servie par sa vue asynchrone, s'il en existe une."""
+    if pattern.name in ASYNC_VIEWS:
+        return path(str(pattern.pattern), ASYNC_VIEWS[pattern.name].as_view(), name=pattern.name)
+    if pattern.name in ASYNC_READ_VIEWS:
+        return path(
+            str(pattern.pattern),
+            read_write_view(ASYNC_READ_VIEWS[pattern.name].as_view(), pattern.callback),
+            name=pattern.name
+        )
+    return pattern
+
+
+# Routes de apis/urls.py : lectures de ASYNC_READ_VIEWS, inscription et connexion asynchrones
+# (settings ASYNC_READ_VIEWS).
+urlpatterns = [async_pattern(pattern) for pattern in urls.urlpatterns]
@@ -0,0 +1,248 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import update_last_login
+from django.db import transaction
+from django.http import Http404
+from rest_framework import exceptions, status
+from rest_framework.response import Response
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from accounts.authentication import aauthenticate_credentials
+from accounts.hashers import amake_password
+from helpers.sqlite import retry_on_lock
+from projects.models import Project
+from .views import (
+    SignupAPIView, LoginAPIView, ProjectListAPIView, ProjectDetailAPIView, ContributorsAPIView, IssuesAPIView,
+    CommentsAPIView
+)
+
+
+class AsyncAPIViewMixin:
+    """
+    Vue DRF exécutée en asynchrone (ASGI) : authentification (aauthenticate) et permissions
+    (ahas_permission, ahas_object_permission) attendues, gestionnaires de méthode synchrones ou asynchrones.
+    Les classes d'authentification et de permission sans version asynchrone sont appelées dans un thread.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        """Version asynchrone de APIView.initial."""
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        await self.aperform_authentication(request)
+        await self.acheck_permissions(request)
+        if self.get_throttles():
+            await sync_to_async(self.check_throttles)(request)
+
+    async def aperform_authentication(self, request):
+        """Version asynchrone de Request._authenticate."""
+        for authenticator in request.authenticators:
+            authenticate = getattr(authenticator, 'aauthenticate', None) or sync_to_async(authenticator.authenticate)
+            try:
+                user_auth_tuple = await authenticate(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+
+        request._not_authenticated()
+
+    async def acheck_permissions(self, request):
+        for permission in self.get_permissions():
+            has_permission = (
+                getattr(permission, 'ahas_permission', None) or sync_to_async(permission.has_permission)
+            )
+            if not await has_permission(request, self):
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, 'message', None),
+                    code=getattr(permission, 'code', None)
+                )
+
+    async def acheck_object_permissions(self, request, obj):
+        for permission in self.get_permissions():
+            has_object_permission = (
+                getattr(permission, 'ahas_object_permission', None)
+                or sync_to_async(permission.has_object_permission)
+            )
+            if not await has_object_permission(request, self, obj):
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, 'message', None),
+                    code=getattr(permission, 'code', None)
+                )
+
+
+class AsyncReadMixin(AsyncAPIViewMixin):
+    """
+    Vue DRF en lecture seule exécutée en asynchrone : lectures par l'ORM asynchrone.
+    Les écritures restent servies par les vues synchrones (voir apis.async_urls).
+    """
+
+    http_method_names = ['get', 'head', 'options']
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+
+    async def alist(self, request, *args, **kwargs):
+        """Liste des vues FastListMixin (plan de lecture ou serializer)."""
+        queryset = self.list_queryset(self.filter_queryset(self.get_queryset()))
+
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(await self.alist_data(page))
+        return Response(await self.alist_data(queryset))
+
+
+class AsyncConditionalListMixin(AsyncReadMixin):
+    """Liste asynchrone conditionnelle (ConditionalListMixin) : version lue par l'ORM asynchrone."""
+
+    async def get(self, request, *args, **kwargs):
+        etag = self.get_list_etag(request, await self.get_list_version_queryset().afirst())
+        response = self.not_modified(request, etag)
+        if response is None:
+            response = await self.alist(request, *args, **kwargs)
+        return self.set_list_etag(response, etag)
+
+
+class AsyncProjectListAPIView(AsyncReadMixin, ProjectListAPIView):
+    """Version asynchrone de la liste des projets de l'utilisateur connecté."""
+
+    async def get(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+
+class AsyncProjectDetailAPIView(AsyncReadMixin, ProjectDetailAPIView):
+    """Version asynchrone du détail du projet (consultation conditionnelle)."""
+
+    async def get(self, request, *args, **kwargs):
+        return self.conditional_retrieve(request, await self.aget_object())
+
+    async def aget_object(self):
+        obj = await (
+            Project.objects.prefetch_related('contributors').filter(project_id=self.kwargs['project_id']).afirst()
+        )
+        if obj is None:
+            raise Http404("Aucun projet ne correspond à la requête.")
+        await self.acheck_object_permissions(self.request, obj)
+        return obj
+
+
+class AsyncContributorsAPIView(AsyncConditionalListMixin, ContributorsAPIView):
+    """Version asynchrone de la liste des collaborateurs au projet (liste conditionnelle)."""
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.list_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+
+        if not page and not await queryset.aexists():
+            return Response(status=status.HTTP_403_FORBIDDEN)
+
+        if page is not None:
+            return self.get_paginated_response(await self.alist_data(page))
+
+        return Response(await self.alist_data(queryset))
+
+
+class AsyncIssuesAPIView(AsyncConditionalListMixin, IssuesAPIView):
+    """Version asynchrone de la liste des problèmes du projet (liste conditionnelle, recherche avec ?q=)."""
+
+
+class AsyncCommentsAPIView(AsyncConditionalListMixin, CommentsAPIView):
+    """Version asynchrone de la liste des commentaires du problème (liste conditionnelle)."""
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        page = await self.apaginate_queryset(queryset)
+
+        if not page and not await queryset.aexists():
+            return Response(status=status.HTTP_404_NOT_FOUND)
+
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer([comment async for comment in queryset], many=True)
+        return Response(serializer.data)
+
+
+class AsyncSignupAPIView(AsyncAPIViewMixin, SignupAPIView):
+    """
+    Version asynchrone de l'inscription : le mot de passe est haché dans le pool borné de accounts.hashers
+    sans occuper de thread, puis le compte est créé (transaction rejouée si la base est verrouillée).
+    """
+
+    http_method_names = ['post', 'options']
+
+    async def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        encoded_password = await amake_password(serializer.validated_data['password'])
+        data = await sync_to_async(retry_on_lock(self.save_user))(serializer, encoded_password)
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def save_user(self, serializer, encoded_password):
+        with transaction.atomic():
+            serializer.save(encoded_password=encoded_password)
+        return serializer.data
+
+
+class AsyncLoginAPIView(AsyncAPIViewMixin, LoginAPIView):
+    """
+    Version asynchrone de la connexion (TokenObtainPairView) : le mot de passe est vérifié, et rehaché
+    si besoin, dans le pool borné de accounts.hashers ; réponses identiques à la vue synchrone.
+    """
+
+    http_method_names = ['post', 'options']
+
+    async def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        attrs = serializer.to_internal_value(request.data)
+        user = await aauthenticate_credentials(attrs[serializer.username_field], attrs['password'])
+        if not jwt_settings.USER_AUTHENTICATION_RULE(user):
+            raise exceptions.AuthenticationFailed(serializer.error_messages['no_active_account'], 'no_active_account')
+        data = await sync_to_async(retry_on_lock(self.obtain_tokens))(serializer, user)
+        return Response(data, status=status.HTTP_200_OK)
+
+    def obtain_tokens(self, serializer, user):
+        """Paire de jetons de TokenObtainPairSerializer.validate pour l'utilisateur authentifié."""
+        with transaction.atomic():
+            refresh = serializer.get_token(user)
+            data = {'refresh': str(refresh), 'access': str(refresh.access_token)}
+            if jwt_settings.UPDATE_LAST_LOGIN:
+                update_last_login(None, user)
+        return data
@@ -0,0 +1,79 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+class ConditionalRetrieveMixin:
+    """
+    Requêtes conditionnelles (If-None-Match, If-Modified-Since) sur les vues de détail.
+    L'ETag fort et le Last-Modified sont calculés à partir des dates de modification (TrackingModel.updated_at)
+    de l'objet et des objets intégrés à sa représentation, et de l'URL (?fields=, ?expand=) :
+    une réponse 304 est retournée avant le serializer.
+    """
+
+    def get_validator_dates(self, instance):
+        """Dates de modification dont dépend la représentation de l'objet."""
+        return [instance.updated_at]
+
+    def get_etag(self, instance, dates):
+        digest = hashlib.sha1(
+            f'{instance._meta.label}:{instance.pk}:{self.request.get_full_path()}:'
+            f'{self.request.accepted_renderer.format}'.encode()
+        )
+        for date in dates:
+            digest.update(date.isoformat().encode())
+        return quote_etag(digest.hexdigest())
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_retrieve(request, self.get_object())
+
+    def conditional_retrieve(self, request, instance):
+        """Réponse 304, ou représentation de l'objet déjà chargé, avec son ETag et son Last-Modified."""
+        dates = self.get_validator_dates(instance)
+        etag = self.get_etag(instance, dates)
+        last_modified = int(max(dates).timestamp())
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            serializer = self.get_serializer(instance)
+            response = Response(serializer.data)
+        response.headers['ETag'] = etag
+        response.headers['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class ConditionalListMixin:
+    """
+    Requêtes conditionnelles (If-None-Match) sur les listes.
+    L'ETag fort dépend de la version de la collection (compteur incrémenté à chaque écriture), lue par une
+    seule recherche par clé primaire, et de l'URL : une liste inchangée répond 304 sans interroger ses lignes.
+    """
+
+    def get_list_version_queryset(self):
+        """Requête (values_list) des valeurs identifiant l'état de la collection, sans ligne si elle n'existe pas."""
+        raise NotImplementedError
+
+    def get_list_etag(self, request, version):
+        if version is None:
+            return None
+        digest = hashlib.sha1(
+            f'{version}:{request.get_full_path()}:{request.accepted_renderer.format}'.encode()
+        )
+        return quote_etag(digest.hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_list_etag(request, self.get_list_version_queryset().first())
+        response = self.not_modified(request, etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return self.set_list_etag(response, etag)
+
+    def not_modified(self, request, etag):
+        return None if etag is None else get_conditional_response(request, etag=etag)
+
+    def set_list_etag(self, response, etag):
+        if etag is not None and response.status_code in (200, 304):
+            response.headers['ETag'] = etag
+        return response
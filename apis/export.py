@@ -0,0 +1,92 @@
+import csv
+import itertools
+import json
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from projects.models import Project, Contributor, Issue, Comment
+from .fastpath import ValuesPlan, ISSUE_PLAN
+from .serializers import ProjectDetailSerializer, ContributorSerializer, CommentSerializer
+
+# Forme des exports : tous les champs des serializers, objets imbriqués réduits à leur clé primaire
+# (comme ?expand= sans valeur, voir SparseFieldsMixin).
+EXPORT_SHAPE = (None, {})
+
+PROJECT_EXPORT_PLAN = ValuesPlan(ProjectDetailSerializer, shape=EXPORT_SHAPE)
+CONTRIBUTOR_EXPORT_PLAN = ValuesPlan(ContributorSerializer, shape=EXPORT_SHAPE)
+ISSUE_EXPORT_PLAN = ISSUE_PLAN.for_shape(EXPORT_SHAPE)
+# Le UUIDField de l'auteur rend str(CustomUser), soit l'email (comme pour les problèmes).
+COMMENT_EXPORT_PLAN = ValuesPlan(CommentSerializer, overrides={
+    'author_user_id': 'author_user_id__email',
+}, shape=EXPORT_SHAPE)
+
+# Types d'enregistrements de l'export, dans l'ordre de l'export NDJSON.
+EXPORT_RECORDS = ('project', 'contributor', 'issue', 'comment')
+
+
+def export_sections(project_id, records=EXPORT_RECORDS, using=None):
+    """
+    Sections (type d'enregistrement, plan, queryset) de l'export du projet, lues sur l'alias `using`.
+    Chaque section suit l'ordre d'un index : problèmes par date de création, commentaires regroupés par problème
+    dans le même ordre, puis par date de création.
+    """
+    querysets = {
+        'project': Project.objects.filter(project_id=project_id),
+        'contributor': Contributor.objects.filter(project_id=project_id).order_by('created_at', 'contributor_id'),
+        'issue': Issue.objects.filter(project_id=project_id).order_by('created_at', 'issue_id'),
+        'comment': Comment.objects.filter(issue_id__project_id=project_id).order_by(
+            'issue_id__created_at', 'issue_id', 'created_at', 'comment_id'
+        ),
+    }
+    plans = {
+        'project': PROJECT_EXPORT_PLAN,
+        'contributor': CONTRIBUTOR_EXPORT_PLAN,
+        'issue': ISSUE_EXPORT_PLAN,
+        'comment': COMMENT_EXPORT_PLAN,
+    }
+    return [(record, plans[record], querysets[record].using(using)) for record in records]
+
+
+def iter_rendered(plan, queryset, chunk_size=1000):
+    """
+    Rendu des lignes du queryset par le plan, lues par un curseur (iterator) et rendues par lots de chunk_size :
+    la mémoire utilisée ne dépend pas du nombre de lignes.
+    """
+    rows = plan.queryset(queryset).iterator(chunk_size=chunk_size)
+    for chunk in iter(lambda: list(itertools.islice(rows, chunk_size)), []):
+        yield from plan.render(chunk)
+
+
+def ndjson_lines(sections, chunk_size=1000):
+    """Une ligne JSON par enregistrement (encodeur JSON de DRF), son type dans la clé 'record'."""
+    for record, plan, queryset in sections:
+        for data in iter_rendered(plan, queryset, chunk_size):
+            yield json.dumps(
+                {'record': record, **data}, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')
+            ) + '\n'
+
+
+class Echo:
+    """Pseudo-fichier dont write() retourne la ligne écrite par csv.writer au lieu de la conserver."""
+
+    def write(self, value):
+        return value
+
+
+def csv_value(value):
+    """Valeur d'une cellule : listes et objets encodés en JSON, None en cellule vide."""
+    if value is None:
+        return ''
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+    return value
+
+
+def csv_lines(section, chunk_size=1000):
+    """CSV d'une section : ligne d'en-tête (champs du serializer) puis une ligne par enregistrement."""
+    record, plan, queryset = section
+    writer = csv.writer(Echo())
+    fields = [name for name, getter in plan.getters]
+    yield writer.writerow(fields)
+    for data in iter_rendered(plan, queryset, chunk_size):
+        yield writer.writerow([csv_value(data[name]) for name in fields])
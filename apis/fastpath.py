@@ -0,0 +1,238 @@
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import ManyToManyField, QuerySet
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+from helpers.cache import LRUCache
+from helpers.metrics import timed
+from .renderers import FAST_RENDERER_CLASSES
+from .serializers import ProjectListSerializer, ContributorSerializer, IssueSerializer, get_request_shape
+
+
+def format_datetime(value, tz):
+    """Rendu identique à serializers.DateTimeField (ISO 8601, fuseau courant, 'Z' pour UTC)."""
+    if value is None:
+        return None
+    if tz is not None:
+        value = value.astimezone(tz)
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+class ValuesPlan:
+    """
+    Plan de rendu en lecture seule d'un serializer, compilé une fois à partir de ses champs :
+    colonnes lues par values_list (jointures comprises) et fonction de rendu de chaque champ.
+    Les relations multiples (liste des clés primaires) sont chargées par une requête groupée par page.
+    Le rendu est identique à celui du serializer pour les types de champs pris en charge.
+    """
+
+    def __init__(self, serializer_class, overrides=None, shape=None, keyset_fields=('created_at',)):
+        """
+        overrides : champ -> colonne rendue telle quelle (ex. str() d'une relation).
+        shape : forme (fields, expand) de ?fields= et ?expand= transmise au serializer.
+        keyset_fields : colonnes toujours lues pour les curseurs de KeysetPagination.
+        """
+        self.serializer_class = serializer_class
+        self.overrides = overrides or {}
+        self.keyset_fields = keyset_fields
+        self.model = serializer_class.Meta.model
+        self.columns = []
+        self.relations = []
+        fields, expand = shape or (None, None)
+        serializer = serializer_class(fields=fields, expand=expand)
+        self.getters = self.compile(serializer, self.model, '', self.overrides)
+        for name in (*keyset_fields, 'pk'):
+            self.column(name)
+        self.shaped_plans = LRUCache(max_entries=128, timeout=None)
+
+    def for_shape(self, shape):
+        """Plan de la forme demandée, compilé à la première demande puis conservé (cache borné)."""
+        if shape is None:
+            return self
+        key = json.dumps(shape, sort_keys=True)
+        plan = self.shaped_plans.get(key)
+        if plan is None:
+            plan = ValuesPlan(self.serializer_class, self.overrides, shape, self.keyset_fields)
+            self.shaped_plans.set(key, plan)
+        return plan
+
+    def column(self, lookup):
+        """Retourne l'indice de la colonne dans les lignes lues, en l'ajoutant si besoin."""
+        if lookup not in self.columns:
+            self.columns.append(lookup)
+        return self.columns.index(lookup)
+
+    def compile(self, serializer, model, prefix, overrides):
+        return [
+            (name, self.compile_field(name, field, model, prefix, overrides))
+            for name, field in serializer.fields.items() if not field.write_only
+        ]
+
+    def compile_field(self, name, field, model, prefix, overrides):
+        source = '__'.join(field.source_attrs)
+        lookup = prefix + source
+
+        if name in overrides:
+            return self.value_getter(self.column(prefix + overrides[name]))
+        if isinstance(field, serializers.BaseSerializer):
+            nested = self.compile(field, field.Meta.model, f'{lookup}__', {})
+            return self.nested_getter(self.column(lookup), nested)
+        if isinstance(field, ManyRelatedField) and isinstance(field.child_relation, PrimaryKeyRelatedField):
+            return self.relation_getter(model, source, prefix)
+        if isinstance(field, PrimaryKeyRelatedField) and field.pk_field is None:
+            return self.value_getter(self.column(lookup))
+        if isinstance(field, serializers.DateTimeField):
+            if getattr(field, 'format', api_settings.DATETIME_FORMAT) != ISO_8601:
+                raise ImproperlyConfigured(f"{name} : seul le format de date ISO 8601 est pris en charge.")
+            return self.datetime_getter(self.column(lookup))
+        if isinstance(field, serializers.UUIDField):
+            if model._meta.get_field(source).is_relation or field.uuid_format != 'hex_verbose':
+                raise ImproperlyConfigured(f"{name} : rendu du champ à préciser dans overrides.")
+            return self.uuid_getter(self.column(lookup))
+        if isinstance(field, (serializers.CharField, serializers.ChoiceField, serializers.IntegerField)):
+            return self.value_getter(self.column(lookup))
+        raise ImproperlyConfigured(f"{name} : type de champ {type(field).__name__} non pris en charge.")
+
+    @staticmethod
+    def value_getter(index):
+        return lambda row, context: row[index]
+
+    @staticmethod
+    def uuid_getter(index):
+        return lambda row, context: None if row[index] is None else str(row[index])
+
+    @staticmethod
+    def datetime_getter(index):
+        return lambda row, context: format_datetime(row[index], context['tz'])
+
+    @staticmethod
+    def nested_getter(index, getters):
+        def get(row, context):
+            if row[index] is None:
+                return None
+            return {name: getter(row, context) for name, getter in getters}
+        return get
+
+    def relation_getter(self, model, source, prefix):
+        model_field = model._meta.get_field(source)
+        if not isinstance(model_field, ManyToManyField):
+            raise ImproperlyConfigured(f"{source} : seules les relations ManyToMany sont prises en charge.")
+        relation = len(self.relations)
+        self.relations.append((self.column(prefix + model._meta.pk.name), model_field))
+        return lambda row, context: context['relations'][relation].get(row[self.relations[relation][0]], [])
+
+    @staticmethod
+    def relation_pairs(model_field, keys):
+        """Couples (clé de la ligne, clé primaire liée) de la relation multiple pour les clés de la page."""
+        query_name = model_field.related_query_name()
+        return (
+            model_field.related_model._default_manager
+            .filter(**{f'{query_name}__in': keys})
+            .values_list(query_name, 'pk')
+        )
+
+    @staticmethod
+    def group_pairs(pairs):
+        related = defaultdict(list)
+        for key, related_pk in pairs:
+            related[key].append(related_pk)
+        return related
+
+    def load_relations(self, rows):
+        """Charge les clés primaires de chaque relation multiple de la page, en une requête par relation."""
+        loaded = []
+        for index, model_field in self.relations:
+            keys = {row[index] for row in rows}
+            loaded.append(self.group_pairs(self.relation_pairs(model_field, keys) if keys else ()))
+        return loaded
+
+    async def aload_relations(self, rows):
+        """Version asynchrone de load_relations (ORM asynchrone)."""
+        loaded = []
+        for index, model_field in self.relations:
+            keys = {row[index] for row in rows}
+            pairs = [pair async for pair in self.relation_pairs(model_field, keys)] if keys else ()
+            loaded.append(self.group_pairs(pairs))
+        return loaded
+
+    def queryset(self, queryset):
+        """Remplace les instances du queryset par les lignes du plan (compatibles avec la pagination)."""
+        return queryset.prefetch_related(None).values_list(*self.columns, named=True)
+
+    def render(self, rows):
+        rows = list(rows)
+        return self.render_rows(rows, self.load_relations(rows))
+
+    async def arender(self, rows):
+        """Version asynchrone de render : lignes et relations multiples lues par l'ORM asynchrone."""
+        if isinstance(rows, QuerySet):
+            rows = [row async for row in rows]
+        return self.render_rows(rows, await self.aload_relations(rows))
+
+    def render_rows(self, rows, relations):
+        context = {
+            'tz': timezone.get_current_timezone() if settings.USE_TZ else None,
+            'relations': relations,
+        }
+        getters = self.getters
+        with timed('serializer'):
+            return [{name: getter(row, context) for name, getter in getters} for row in rows]
+
+
+PROJECT_LIST_PLAN = ValuesPlan(ProjectListSerializer)
+CONTRIBUTOR_PLAN = ValuesPlan(ContributorSerializer)
+# Le UUIDField de l'auteur et de l'assigné rend str(CustomUser), soit l'email.
+ISSUE_PLAN = ValuesPlan(IssueSerializer, overrides={
+    'author_user_id': 'author_user_id__email',
+    'assigned_user_id': 'assigned_user_id__email',
+}, keyset_fields=('created_at', 'last_activity_at'))
+
+
+class FastListMixin:
+    """
+    Rend les listes par le plan fast_plan au lieu du serializer (settings FAST_LIST_SERIALIZERS),
+    compilé pour la forme demandée par ?fields= et ?expand=, et les encode par le FastJSONRenderer.
+    """
+
+    fast_plan = None
+    renderer_classes = FAST_RENDERER_CLASSES
+
+    def use_fast_plan(self):
+        return self.fast_plan is not None and getattr(settings, 'FAST_LIST_SERIALIZERS', True)
+
+    def get_fast_plan(self):
+        return self.fast_plan.for_shape(get_request_shape(self.request))
+
+    def list_queryset(self, queryset):
+        return self.get_fast_plan().queryset(queryset) if self.use_fast_plan() else queryset
+
+    def list_data(self, items):
+        if self.use_fast_plan():
+            return self.get_fast_plan().render(items)
+        return self.get_serializer(items, many=True).data
+
+    async def alist_data(self, items):
+        """Version asynchrone de list_data pour les vues asynchrones (apis.async_views)."""
+        if self.use_fast_plan():
+            return await self.get_fast_plan().arender(items)
+        if isinstance(items, QuerySet):
+            items = [item async for item in items]
+        return self.get_serializer(items, many=True).data
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.list_queryset(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.list_data(page))
+        return Response(self.list_data(queryset))
@@ -0,0 +1,158 @@
+import json
+import platform
+import statistics
+import time
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apis.scenarios import SCENARIO_PASSWORD, build_route_calls, call_route
+from helpers.metrics import QueryTimer
+from projects.models import Contributor, Issue, Comment
+
+CustomUser = get_user_model()
+
+
+def percentile(values, rank):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(rank / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Appelle chaque route de apis/urls.py avec le client de test sur la base configurée (par exemple "
+        "générée par seed_data) et mesure les percentiles de latence, le nombre et la durée des requêtes SQL. "
+        "Les écritures sont annulées après chaque appel. Les résultats sont enregistrés en JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--output', default=None, help="Fichier JSON des résultats.")
+        parser.add_argument('--compare', default=None, help="Fichier JSON d'une exécution précédente à comparer.")
+        parser.add_argument('--routes', nargs='*', default=None,
+                            help="Routes à mesurer, ex. 'GET issues' (toutes par défaut).")
+        parser.add_argument('--batch-size', type=int, default=100, help="Taille des lots des créations groupées.")
+        parser.add_argument('--password', default=SCENARIO_PASSWORD,
+                            help="Mot de passe de l'auteur du projet mesuré, pour la route de connexion.")
+
+    def handle(self, *args, **options):
+        setup_test_environment(debug=False)
+        try:
+            calls = build_route_calls(self.sample_data(options['password'], options['batch_size']))
+            if options['routes']:
+                calls = [call for call in calls if f'{call.method.upper()} {call.name}' in options['routes']]
+            results = {
+                f'{call.method.upper()} {call.name}': self.measure(call, options['iterations'], options['warmup'])
+                for call in calls
+            }
+        finally:
+            teardown_test_environment()
+
+        report = {
+            'date': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'database': connection.vendor,
+            'iterations': options['iterations'],
+            'routes': results,
+        }
+        previous = self.load(options['compare'])['routes'] if options['compare'] else {}
+        self.print_report(results, previous)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(f"Résultats enregistrés dans {options['output']}")
+
+    def sample_data(self, password, batch_size):
+        """Choisit le projet le plus actif, ses contributeurs, un problème commenté et son dernier commentaire."""
+        busiest = (
+            Issue.objects.values('project_id').annotate(issues=Count('issue_id')).order_by('-issues').first()
+        )
+        if busiest is None:
+            raise CommandError("Aucun problème en base : lancez d'abord la commande seed_data.")
+
+        members = Contributor.objects.filter(project_id=busiest['project_id']).select_related('user_id', 'project_id')
+        author = next((member for member in members if member.is_author()), None)
+        if author is None:
+            raise CommandError("Le projet le plus actif n'a pas d'auteur.")
+        contributor = next((member for member in members if not member.is_author()), author)
+        outsider = CustomUser.objects.exclude(project_contributors=author.project_id).first()
+        if outsider is None:
+            raise CommandError("Aucun utilisateur extérieur au projet pour la route d'ajout de contributeur.")
+
+        comment = (
+            Comment.objects.filter(issue_id__project_id=busiest['project_id'])
+            .select_related('issue_id__author_user_id', 'author_user_id')
+            .order_by('-created_at')
+            .first()
+        )
+        if comment is None:
+            raise CommandError("Aucun commentaire sur le projet le plus actif.")
+
+        return SimpleNamespace(
+            author=author.user_id, contributor=contributor.user_id, outsider=outsider, project=author.project_id,
+            issue=comment.issue_id, comment=comment, issue_author=comment.issue_id.author_user_id,
+            comment_author=comment.author_user_id, password=password, batch_size=batch_size,
+        )
+
+    def measure(self, call, iterations, warmup):
+        client = APIClient()
+        if call.user is not None:
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(call.user)}')
+
+        latencies, query_counts, sql_times = [], [], []
+        statuses = set()
+        for iteration in range(warmup + iterations):
+            timer = QueryTimer()
+            with transaction.atomic():
+                with connection.execute_wrapper(timer):
+                    start = time.perf_counter()
+                    response = call_route(client, call)
+                    elapsed = time.perf_counter() - start
+                transaction.set_rollback(True)
+            if iteration >= warmup:
+                latencies.append(elapsed * 1000)
+                query_counts.append(timer.count)
+                sql_times.append(timer.duration * 1000)
+                statuses.add(response.status_code)
+
+        return {
+            'path': call.path,
+            'status': sorted(statuses),
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p90_ms': round(percentile(latencies, 90), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'mean_ms': round(statistics.fmean(latencies), 3),
+            'queries': round(statistics.fmean(query_counts), 2),
+            'sql_ms': round(statistics.fmean(sql_times), 3),
+        }
+
+    def load(self, path):
+        try:
+            with open(path, encoding='utf-8') as previous:
+                return json.load(previous)
+        except (OSError, ValueError) as error:
+            raise CommandError(f"Impossible de lire {path} : {error}")
+
+    def print_report(self, results, previous):
+        self.stdout.write(
+            f"{'route':<28} {'statut':>8} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'requêtes':>9} {'SQL ms':>9}"
+        )
+        for label, result in results.items():
+            line = (
+                f"{label:<28} {','.join(map(str, result['status'])):>8} {result['p50_ms']:>9.2f} "
+                f"{result['p90_ms']:>9.2f} {result['p99_ms']:>9.2f} {result['queries']:>9.1f} {result['sql_ms']:>9.2f}"
+            )
+            if label in previous:
+                change = (result['p50_ms'] - previous[label]['p50_ms']) / max(previous[label]['p50_ms'], 1e-9)
+                line += f"  p50 {change:+.0%}"
+            self.stdout.write(line)
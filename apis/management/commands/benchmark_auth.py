@@ -0,0 +1,60 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from apis.scenarios import SCENARIO_PASSWORD
+from .benchmark_concurrency import Command as BenchmarkConcurrencyCommand
+
+CustomUser = get_user_model()
+
+
+class Command(BenchmarkConcurrencyCommand):
+    help = (
+        "Mesure sous charge concurrente le débit (requêtes/s) et les percentiles de latence de l'inscription "
+        "puis de la connexion de nouveaux comptes, sur des serveurs déjà démarrés avec la base configurée "
+        "(--target NOM=URL, répétable). Les comptes créés sont supprimés à la fin de la mesure."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', action='append', required=True, metavar='NOM=URL',
+                            help="Serveur à mesurer, répétable (le premier sert de référence).")
+        parser.add_argument('--concurrency', type=int, default=16, help="Nombre de clients simultanés.")
+        parser.add_argument('--users', type=int, default=200, help="Nombre de comptes créés par serveur.")
+        parser.add_argument('--timeout', type=float, default=60.0)
+        parser.add_argument('--output', default=None, help="Fichier JSON des résultats.")
+
+    def handle(self, *args, **options):
+        targets = [self.parse_target(target) for target in options['target']]
+        headers = {'Accept': 'application/json'}
+        results = {'signup': {}, 'login': {}}
+        prefixes = []
+        try:
+            for name, url in targets:
+                prefix = f'benchmark-{uuid.uuid4().hex[:12]}'
+                prefixes.append(prefix)
+                accounts = [
+                    {'email': f'{prefix}-{index}@example.com', 'first_name': 'Benchmark', 'last_name': 'Utilisateur',
+                     'password': SCENARIO_PASSWORD, 'password2': SCENARIO_PASSWORD}
+                    for index in range(options['users'])
+                ]
+                results['signup'][name] = self.run(
+                    [(f'{url}/signup/', account) for account in accounts], headers, options, expected=(201,)
+                )
+                results['login'][name] = self.run(
+                    [(f'{url}/login/', {'email': account['email'], 'password': account['password']})
+                     for account in accounts],
+                    headers, options, expected=(200,)
+                )
+        finally:
+            for prefix in prefixes:
+                CustomUser.objects.filter(email__startswith=f'{prefix}-').delete()
+
+        self.print_report(results, [name for name, url in targets])
+        if options['output']:
+            self.save(options['output'], {
+                'date': timezone.now().isoformat(),
+                'concurrency': options['concurrency'],
+                'users': options['users'],
+                'routes': results,
+            })
@@ -0,0 +1,116 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apis.async_urls import ASYNC_READ_VIEWS
+from apis.scenarios import SCENARIO_PASSWORD, build_route_calls
+from .benchmark_api import Command as BenchmarkApiCommand, percentile
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare sous charge concurrente le débit (requêtes/s) et les percentiles de latence des routes de lecture "
+        "servies par des serveurs déjà démarrés sur la base configurée (par exemple générée par seed_data), "
+        "ex. --target wsgi=http://127.0.0.1:8000 pour gunicorn config.wsgi "
+        "et --target asgi=http://127.0.0.1:8001 pour uvicorn config.asgi:application (vues asynchrones)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', action='append', required=True, metavar='NOM=URL',
+                            help="Serveur à mesurer, répétable (le premier sert de référence).")
+        parser.add_argument('--concurrency', type=int, default=64, help="Nombre de clients simultanés.")
+        parser.add_argument('--requests', type=int, default=1000, help="Nombre de requêtes par route et serveur.")
+        parser.add_argument('--timeout', type=float, default=30.0)
+        parser.add_argument('--routes', nargs='*', default=None,
+                            help=f"Routes GET à mesurer (par défaut : {', '.join(ASYNC_READ_VIEWS)}).")
+        parser.add_argument('--output', default=None, help="Fichier JSON des résultats.")
+
+    def handle(self, *args, **options):
+        targets = [self.parse_target(target) for target in options['target']]
+        routes = options['routes'] or list(ASYNC_READ_VIEWS)
+        sample = BenchmarkApiCommand().sample_data(SCENARIO_PASSWORD, 1)
+        calls = [call for call in build_route_calls(sample) if call.method == 'get' and call.name in routes]
+
+        results = {}
+        for call in calls:
+            headers = {'Authorization': f'Bearer {AccessToken.for_user(call.user)}', 'Accept': 'application/json'}
+            results[call.name] = {
+                name: self.measure(f'{url}{call.path}', headers, options) for name, url in targets
+            }
+
+        self.print_report(results, [name for name, url in targets])
+        if options['output']:
+            self.save(options['output'], {
+                'date': timezone.now().isoformat(),
+                'concurrency': options['concurrency'],
+                'requests': options['requests'],
+                'routes': results,
+            })
+
+    def save(self, path, report):
+        with open(path, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2)
+        self.stdout.write(f"Résultats enregistrés dans {path}")
+
+    def parse_target(self, target):
+        name, separator, url = target.partition('=')
+        if not separator or not url.startswith(('http://', 'https://')):
+            raise CommandError(f"Serveur invalide : {target} (attendu NOM=URL).")
+        return name, url.rstrip('/')
+
+    def fetch(self, url, data, headers, timeout):
+        """Requête GET, ou POST du corps JSON `data`, et sa latence en millisecondes."""
+        if data is not None:
+            data = json.dumps(data).encode()
+            headers = {**headers, 'Content-Type': 'application/json'}
+        start = time.perf_counter()
+        try:
+            with urlopen(Request(url, data=data, headers=headers), timeout=timeout) as response:
+                response.read()
+                status = response.status
+        except HTTPError as error:
+            status = error.code
+        except (URLError, OSError):
+            status = None
+        return status, (time.perf_counter() - start) * 1000
+
+    def measure(self, url, headers, options):
+        """Mesure la route après une salve de préchauffage."""
+        self.run([(url, None)] * options['concurrency'], headers, options)
+        return self.run([(url, None)] * options['requests'], headers, options)
+
+    def run(self, requests, headers, options, expected=(200, 304)):
+        """Envoie les requêtes (URL, corps JSON ou None) par `concurrency` clients simultanés."""
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            start = time.perf_counter()
+            responses = list(
+                pool.map(lambda request: self.fetch(*request, headers, options['timeout']), requests)
+            )
+            elapsed = time.perf_counter() - start
+
+        latencies = [latency for status, latency in responses]
+        return {
+            'rps': round(len(responses) / elapsed, 1),
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'errors': sum(1 for status, latency in responses if status not in expected),
+        }
+
+    def print_report(self, results, names):
+        self.stdout.write(
+            f"{'route':<16} {'serveur':<10} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'erreurs':>8} {'gain':>7}"
+        )
+        for route, measures in results.items():
+            reference = measures[names[0]]['rps']
+            for name in names:
+                result = measures[name]
+                self.stdout.write(
+                    f"{route:<16} {name:<10} {result['rps']:>9.1f} {result['p50_ms']:>9.2f} "
+                    f"{result['p99_ms']:>9.2f} {result['errors']:>8} {result['rps'] / reference:>6.2f}x"
+                )
@@ -0,0 +1,163 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from django.utils import timezone
+
+from helpers.sqlite import SQLITE_PRAGMA_PROFILES, is_lock_error, retry_on_lock
+from .benchmark_api import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure la contention SQLite entre écrivains et lecteurs simultanés (un thread et une connexion chacun) "
+        "pour chaque profil de PRAGMA de helpers.sqlite, sur une base temporaire : débits, percentiles de latence, "
+        "nouveaux essais et erreurs « database is locked »."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', nargs='*', default=['default', 'wal'],
+                            help=f"Profils comparés ({', '.join(SQLITE_PRAGMA_PROFILES)}).")
+        parser.add_argument('--writers', type=int, default=4, help="Nombre de threads écrivains.")
+        parser.add_argument('--readers', type=int, default=4, help="Nombre de threads lecteurs.")
+        parser.add_argument('--duration', type=float, default=5.0, help="Durée de chaque mesure (secondes).")
+        parser.add_argument('--rows', type=int, default=10000, help="Lignes insérées avant la mesure.")
+        parser.add_argument('--no-retry', action='store_true',
+                            help="Écritures sans nouvel essai (retry_on_lock désactivé).")
+        parser.add_argument('--output', default=None, help="Fichier JSON des résultats.")
+
+    def handle(self, *args, **options):
+        unknown = set(options['profiles']) - set(SQLITE_PRAGMA_PROFILES)
+        if unknown:
+            raise CommandError(f"Profils inconnus : {', '.join(sorted(unknown))}.")
+
+        results = {}
+        with tempfile.TemporaryDirectory() as directory:
+            for profile in options['profiles']:
+                alias = self.add_database(profile, os.path.join(directory, f'{profile}.sqlite3'))
+                try:
+                    self.create_table(alias, options['rows'])
+                    results[profile] = self.measure(alias, options)
+                finally:
+                    connections[alias].close()
+                    del connections.settings[alias]
+
+        self.print_report(results)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump({
+                    'date': timezone.now().isoformat(),
+                    'writers': options['writers'],
+                    'readers': options['readers'],
+                    'duration': options['duration'],
+                    'retry': not options['no_retry'],
+                    'profiles': results,
+                }, output, indent=2)
+            self.stdout.write(f"Résultats enregistrés dans {options['output']}")
+
+    def add_database(self, profile, path):
+        """Alias temporaire : réglages de 'default', base `path` et profil de PRAGMA `profile`."""
+        alias = f'contention_{profile}'
+        connections.settings[alias] = {
+            **connections.settings['default'], 'NAME': path, 'PRAGMAS': profile, 'CONN_MAX_AGE': None,
+        }
+        return alias
+
+    def create_table(self, alias, rows):
+        with transaction.atomic(using=alias), connections[alias].cursor() as cursor:
+            cursor.execute(
+                'CREATE TABLE contention (id INTEGER PRIMARY KEY, author INTEGER NOT NULL, '
+                'body TEXT NOT NULL, created REAL NOT NULL)'
+            )
+            cursor.execute('CREATE INDEX contention_author ON contention (author)')
+            cursor.executemany(
+                'INSERT INTO contention (author, body, created) VALUES (%s, %s, %s)',
+                [(row % 100, 'x' * 200, time.time()) for row in range(rows)]
+            )
+
+    def measure(self, alias, options):
+        deadline = time.monotonic() + options['duration']
+        stats = {'write': [], 'read': [], 'retries': 0, 'write_errors': 0, 'read_errors': 0}
+        lock = threading.Lock()
+
+        def on_retry(attempt, error):
+            with lock:
+                stats['retries'] += 1
+
+        write = self.write if options['no_retry'] else retry_on_lock(self.write, using=alias, on_retry=on_retry)
+
+        def worker(kind, operation, number):
+            latencies, errors = [], 0
+            try:
+                while time.monotonic() < deadline:
+                    start = time.perf_counter()
+                    try:
+                        operation(alias, number)
+                    except OperationalError as error:
+                        if not is_lock_error(error):
+                            raise
+                        errors += 1
+                        continue
+                    latencies.append((time.perf_counter() - start) * 1000)
+            finally:
+                connections[alias].close()
+            with lock:
+                stats[kind].extend(latencies)
+                stats[f'{kind}_errors'] += errors
+
+        threads = [
+            threading.Thread(target=worker, args=('write', write, number)) for number in range(options['writers'])
+        ] + [
+            threading.Thread(target=worker, args=('read', self.read, number)) for number in range(options['readers'])
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        return {
+            'writes_per_s': round(len(stats['write']) / elapsed, 1),
+            'reads_per_s': round(len(stats['read']) / elapsed, 1),
+            'write_p50_ms': round(percentile(stats['write'], 50), 3) if stats['write'] else None,
+            'write_p99_ms': round(percentile(stats['write'], 99), 3) if stats['write'] else None,
+            'read_p50_ms': round(percentile(stats['read'], 50), 3) if stats['read'] else None,
+            'read_p99_ms': round(percentile(stats['read'], 99), 3) if stats['read'] else None,
+            'retries': stats['retries'],
+            'write_errors': stats['write_errors'],
+            'read_errors': stats['read_errors'],
+        }
+
+    def write(self, alias, number):
+        """Transaction d'écriture courte : insertion puis lecture de la ligne insérée."""
+        with transaction.atomic(using=alias), connections[alias].cursor() as cursor:
+            cursor.execute(
+                'INSERT INTO contention (author, body, created) VALUES (%s, %s, %s)', [number, 'y' * 200, time.time()]
+            )
+            cursor.execute('SELECT count(*) FROM contention WHERE author = %s', [number])
+
+    def read(self, alias, number):
+        """Lecture paginée des dernières lignes d'un auteur."""
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                'SELECT id, body, created FROM contention WHERE author = %s ORDER BY id DESC LIMIT 20', [number % 100]
+            )
+            cursor.fetchall()
+
+    def print_report(self, results):
+        self.stdout.write(
+            f"{'profil':<10} {'écr./s':>9} {'p50 ms':>9} {'p99 ms':>9} {'lect./s':>9} {'p50 ms':>9} {'p99 ms':>9} "
+            f"{'essais':>7} {'erreurs':>8}"
+        )
+        for profile, result in results.items():
+            self.stdout.write(
+                f"{profile:<10} {result['writes_per_s']:>9.1f} {result['write_p50_ms'] or 0:>9.2f} "
+                f"{result['write_p99_ms'] or 0:>9.2f} {result['reads_per_s']:>9.1f} "
+                f"{result['read_p50_ms'] or 0:>9.2f} {result['read_p99_ms'] or 0:>9.2f} "
+                f"{result['retries']:>7} {result['write_errors'] + result['read_errors']:>8}"
+            )
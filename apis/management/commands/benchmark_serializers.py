@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from apis.fastpath import PROJECT_LIST_PLAN, CONTRIBUTOR_PLAN, ISSUE_PLAN
+from apis.renderers import FastJSONRenderer
+from apis.views import issue_queryset
+from projects.models import Project, Contributor
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare le débit (lignes/s) des listes de projets, contributeurs et problèmes rendues par les "
+        "ModelSerializer et le JSONRenderer de DRF puis par les plans de apis.fastpath et le FastJSONRenderer, "
+        "sur la base configurée (par exemple générée par seed_data). Vérifie que les deux rendus sont identiques."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help="Nombre de lignes rendues par liste.")
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        ordering = ('-created_at', '-pk')
+        lists = [
+            ('projets', Project.objects.order_by(*ordering), PROJECT_LIST_PLAN),
+            ('contributeurs', Contributor.objects.select_related('user_id').order_by(*ordering), CONTRIBUTOR_PLAN),
+            ('problèmes', issue_queryset().order_by(*ordering), ISSUE_PLAN),
+        ]
+
+        self.stdout.write(f"{'liste':<15} {'lignes':>7} {'serializer l/s':>15} {'plan l/s':>12} {'gain':>7}")
+        for name, queryset, plan in lists:
+            rows = options['rows']
+
+            def serializer_path():
+                return JSONRenderer().render(plan.serializer_class(list(queryset[:rows]), many=True).data)
+
+            def plan_path():
+                return FastJSONRenderer().render(plan.render(plan.queryset(queryset)[:rows]))
+
+            expected, content = serializer_path(), plan_path()
+            if expected != content:
+                raise CommandError(f"Rendu de la liste des {name} différent de celui du serializer.")
+            count = len(plan.render(plan.queryset(queryset)[:rows]))
+            if not count:
+                raise CommandError(f"Aucune ligne pour la liste des {name} : lancez d'abord la commande seed_data.")
+
+            before = count / self.best_time(serializer_path, options['repeat'])
+            after = count / self.best_time(plan_path, options['repeat'])
+            self.stdout.write(f"{name:<15} {count:>7} {before:>15.0f} {after:>12.0f} {after / before:>6.1f}x")
+
+    def best_time(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
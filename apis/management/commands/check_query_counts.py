@@ -0,0 +1,76 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.authentication import user_cache
+from apis.scenarios import seed_scenario, build_route_calls, call_route
+from projects.membership import membership_cache
+from projects.stats import stats_cache
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Vérifie, sur une base de test, que chaque route de apis/urls.py exécute un nombre de requêtes SQL "
+        "constant quelle que soit la taille des pages et des objets imbriqués."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs=2, default=(2, 8), metavar=('SMALL', 'LARGE'))
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            counts = [self.count_queries(size) for size in options['sizes']]
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        failures = []
+        for (label, small), large in zip(counts[0].items(), counts[1].values()):
+            line = f'{label:<32} {small:>4} {large:>4}'
+            if small != large:
+                failures.append(label)
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+
+        if failures:
+            raise CommandError(f"Nombre de requêtes variable pour : {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("Nombre de requêtes constant pour toutes les routes."))
+
+    def count_queries(self, size):
+        """Exécute chaque appel dans un point de sauvegarde annulé et retourne {route: nombre de requêtes}."""
+        counts = {}
+        try:
+            with transaction.atomic():
+                calls = build_route_calls(seed_scenario(size))
+                for call in calls:
+                    counts[f'{call.method.upper()} {call.name}'] = self.run_call(call)
+                raise Rollback
+        except Rollback:
+            pass
+        return counts
+
+    def run_call(self, call):
+        client = APIClient()
+        if call.user is not None:
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(call.user)}')
+        membership_cache.clear()
+        user_cache.clear()
+        stats_cache.clear()
+
+        savepoint = transaction.savepoint()
+        with CaptureQueriesContext(connection) as queries:
+            response = call_route(client, call)
+        transaction.savepoint_rollback(savepoint)
+
+        if response.status_code >= 400:
+            raise CommandError(f'{call.method.upper()} {call.path} : statut {response.status_code}')
+        return len(queries)
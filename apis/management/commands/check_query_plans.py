@@ -0,0 +1,113 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from accounts.compaction import expired_tokens
+from apis.export import export_sections
+from apis.views import (
+    ProjectListAPIView,
+    ContributorsAPIView,
+    IssuesAPIView,
+    CommentsAPIView,
+    issue_queryset,
+    comment_queryset,
+)
+from projects.membership import membership_queryset
+from projects.stats import stats_queryset
+
+CustomUser = get_user_model()
+
+# Requêtes dont le tri temporaire est borné : la liste des projets est recherchée par l'index unique
+# (user_id, project_id) puis triée sur les seuls projets de l'utilisateur, ce qui reste moins coûteux
+# qu'un parcours de tous les projets dans l'ordre d'un index sur created_at. Les statistiques regroupent
+# les seuls problèmes du projet, recherchés par l'index (project_id, created_at). Les commentaires exportés
+# suivent l'ordre de cet index et ne sont triés qu'à l'intérieur de chaque problème (RIGHT PART OF ORDER BY).
+BOUNDED_SORTS = {'projects (offset)', 'projects (cursor)', 'stats', 'export comment'}
+
+
+def keyset_page(queryset, field='created_at'):
+    """Requête d'une page suivante de KeysetPagination (filtre et tri sur le champ de date `field`, pk)."""
+    pk_name = queryset.model._meta.pk.name
+    value, pk = timezone.now(), uuid.uuid4()
+    return queryset.filter(
+        Q(**{f'{field}__lt': value}) | Q(**{field: value, f'{pk_name}__lt': pk})
+    ).order_by(f'-{field}', f'-{pk_name}')
+
+
+class Command(BaseCommand):
+    help = (
+        "Vérifie avec EXPLAIN QUERY PLAN que la requête principale de chaque vue (et de la compaction des jetons) "
+        "parcourt un index et ne nécessite pas de tri temporaire (USE TEMP B-TREE)."
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("Cette vérification analyse les plans de requête SQLite.")
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            failures = [label for label, queryset in self.get_querysets() if not self.check_plan(label, queryset)]
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if failures:
+            raise CommandError(f"Plans de requête sans index ou avec tri temporaire : {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("Toutes les requêtes principales sont indexées et ordonnées par index."))
+
+    def get_querysets(self):
+        user = CustomUser(email='plan@example.com')
+        kwargs = {'project_id': uuid.uuid4(), 'issue_id': uuid.uuid4(), 'comment_id': uuid.uuid4()}
+        request = type('Request', (), {'user': user, 'method': 'GET', 'query_params': {}})
+        activity_request = type('Request', (request,), {'query_params': {'ordering': '-last_activity_at'}})
+
+        def view_queryset(view_class, request=request):
+            return view_class(request=request, kwargs=kwargs).get_queryset()
+
+        projects = ProjectListAPIView(request=request, kwargs={}).get_queryset()
+        contributors = view_queryset(ContributorsAPIView)
+        issues = view_queryset(IssuesAPIView)
+        issues_by_activity = view_queryset(IssuesAPIView, activity_request)
+        comments = view_queryset(CommentsAPIView)
+        return [
+            ('projects (offset)', projects[:10]),
+            ('projects (cursor)', keyset_page(projects)[:11]),
+            ('project_detail', membership_queryset(user).filter(project_id=kwargs['project_id'])[:1]),
+            ('contributors (offset)', contributors[:10]),
+            ('contributors (cursor)', keyset_page(contributors)[:11]),
+            ('issues (offset)', issues[:10]),
+            ('issues (cursor)', keyset_page(issues)[:11]),
+            ('issues by activity (offset)', issues_by_activity[:10]),
+            ('issues by activity (cursor)', keyset_page(issues_by_activity, 'last_activity_at')[:11]),
+            ('issue', issue_queryset().filter(
+                author_user_id=user, project_id=kwargs['project_id'], issue_id=kwargs['issue_id'])),
+            ('comments (offset)', comments[:10]),
+            ('comments (cursor)', keyset_page(comments)[:11]),
+            ('comment', comment_queryset().filter(comment_id=kwargs['comment_id'])),
+            ('stats', stats_queryset(kwargs['project_id'])),
+            *[
+                (f'export {record}', plan.queryset(queryset))
+                for record, plan, queryset in export_sections(kwargs['project_id'])
+            ],
+            ('expired tokens', expired_tokens(timezone.now()).values_list('id', flat=True)[:1000]),
+        ]
+
+    def check_plan(self, label, queryset):
+        plan = queryset.explain()
+        lines = [line.strip(' |-`') for line in plan.splitlines()]
+        problems = [
+            line for line in lines
+            if ('USE TEMP B-TREE' in line and label not in BOUNDED_SORTS)
+            or (line.startswith('SCAN ') and ' USING ' not in line)
+        ]
+        style = self.style.ERROR if problems else self.style.SUCCESS
+        self.stdout.write(style(label))
+        for line in lines:
+            self.stdout.write(f'    {line}')
+        return not problems
@@ -0,0 +1,51 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apis.export import EXPORT_RECORDS, export_sections, ndjson_lines, csv_lines
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporte un projet, ses contributeurs, ses problèmes et leurs commentaires en NDJSON (un enregistrement "
+        "par ligne) ou en CSV (un type d'enregistrement), avec le rendu de l'API /projects/<id>/export/ : "
+        "lecture par lots et écriture au fil de l'eau, en mémoire constante."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('project_id', type=uuid.UUID)
+        parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+        parser.add_argument('--records', nargs='*', choices=EXPORT_RECORDS, default=None,
+                            help="Types d'enregistrements exportés (CSV : un seul, 'issue' par défaut).")
+        parser.add_argument('--chunk-size', type=int, default=1000, help="Lignes lues et rendues par lot.")
+        parser.add_argument('--database', default='default', help="Alias de la base lue.")
+        parser.add_argument('--output', default=None, help="Fichier écrit (sortie standard par défaut).")
+
+    def handle(self, *args, **options):
+        if not Project.objects.using(options['database']).filter(project_id=options['project_id']).exists():
+            raise CommandError(f"Projet introuvable : {options['project_id']}.")
+        records = options['records'] or (EXPORT_RECORDS if options['format'] == 'ndjson' else ['issue'])
+        if options['format'] == 'csv' and len(records) > 1:
+            raise CommandError("L'export CSV ne contient qu'un type d'enregistrement.")
+
+        sections = export_sections(options['project_id'], records, using=options['database'])
+        if options['format'] == 'csv':
+            lines = csv_lines(sections[0], options['chunk_size'])
+        else:
+            lines = ndjson_lines(sections, options['chunk_size'])
+
+        start = time.perf_counter()
+        count = 0
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                for line in lines:
+                    output.write(line)
+                    count += 1
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
+                count += 1
+        elapsed = time.perf_counter() - start
+        self.stderr.write(f"{count} lignes exportées en {elapsed:.1f} s ({count / max(elapsed, 1e-9):.0f} lignes/s).")
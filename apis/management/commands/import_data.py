@@ -0,0 +1,324 @@
+import json
+import os
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from helpers.sqlite import retry_on_lock
+from projects.membership import membership_cache
+from projects.models import Project, Contributor, Issue, Comment
+from projects.stats import stats_cache
+
+CustomUser = get_user_model()
+
+# Enregistrements importés, dans l'ordre d'insertion de chaque lot : modèle et champs validés
+# par les validateurs du modèle (ischarfieldvalidator, isalphavalidator, choix, longueurs).
+IMPORT_RECORDS = {
+    'user': (CustomUser, ('email', 'first_name', 'last_name')),
+    'project': (Project, ('title', 'description', 'type')),
+    'contributor': (Contributor, ('permission', 'role')),
+    'issue': (Issue, ('title', 'description', 'tag', 'priority', 'status')),
+    'comment': (Comment, ('description',)),
+}
+
+# Références de chaque enregistrement : clé de la ligne -> (type référencé, clé étrangère du modèle).
+IMPORT_REFERENCES = {
+    'contributor': {'project': ('project', 'project_id'), 'user': ('user', 'user_id')},
+    'issue': {
+        'project': ('project', 'project_id'),
+        'author': ('user', 'author_user_id'),
+        'assigned': ('user', 'assigned_user_id'),
+    },
+    'comment': {'issue': ('issue', 'issue_id'), 'author': ('user', 'author_user_id')},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Importe des utilisateurs, projets, contributeurs, problèmes et commentaires depuis un fichier JSONL "
+        "(un objet par ligne, type dans la clé 'record', identifiant d'origine dans 'id', références par ces "
+        "identifiants : project, user, issue, author, assigned). Les lignes sont validées par les validateurs "
+        "des modèles et insérées par lots (bulk_create), chaque lot dans sa propre transaction suivie d'un point "
+        "de reprise (--resume). Les clés primaires sont dérivées des identifiants d'origine (uuid5) : "
+        "un lot rejoué n'est pas inséré deux fois, les lignes déjà présentes en base sont signalées et décomptées. "
+        "Les utilisateurs importés n'ont pas de mot de passe utilisable."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help="Fichier JSONL à importer.")
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--namespace', default='import',
+                            help="Nom de la source, espace de noms des clés primaires dérivées (uuid5).")
+        parser.add_argument('--checkpoint', default=None,
+                            help="Fichier du point de reprise (par défaut : <input>.checkpoint).")
+        parser.add_argument('--resume', action='store_true',
+                            help="Reprend après la dernière ligne du point de reprise.")
+        parser.add_argument('--skip-invalid', action='store_true',
+                            help="Ignore les lignes invalides (signalées) au lieu d'interrompre l'import.")
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.verbosity = options['verbosity']
+        self.namespace = uuid.uuid5(uuid.NAMESPACE_URL, options['namespace'])
+        self.checkpoint = options['checkpoint'] or f"{options['input']}.checkpoint"
+        self.password = make_password(None)
+        # Tables de correspondance en mémoire : identifiant d'origine -> clé primaire, par type d'enregistrement.
+        self.ids = {record: {} for record in IMPORT_RECORDS}
+        self.issue_projects = {}
+        self.members = set()
+        self.emails = set()
+        self.commented = set()
+        self.pending = {record: [] for record in IMPORT_RECORDS}
+        self.pending_count = 0
+        self.counts = dict.fromkeys(IMPORT_RECORDS, 0)
+        self.conflicts = dict.fromkeys(IMPORT_RECORDS, 0)
+
+        resume_after = self.read_checkpoint() if options['resume'] else 0
+        if resume_after:
+            self.stdout.write(f"Reprise après la ligne {resume_after}.")
+
+        start = time.perf_counter()
+        try:
+            with open(options['input'], encoding='utf-8') as lines:
+                number, skipped = self.import_lines(lines, resume_after, options['skip_invalid'], start)
+        except OSError as error:
+            raise CommandError(f"Lecture impossible de {options['input']} : {error}")
+        self.flush(number, start)
+        self.finalize()
+
+        if os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+        elapsed = time.perf_counter() - start
+        total = sum(self.counts.values())
+        for record, count in self.counts.items():
+            self.stdout.write(f"{record}: {count} lignes insérées, {self.conflicts[record]} déjà présentes ignorées")
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} lignes importées en {elapsed:.1f} s ({total / max(elapsed, 1e-9):.0f} lignes/s), "
+            f"{sum(self.conflicts.values())} lignes déjà présentes et {skipped} lignes invalides ignorées."
+        ))
+
+    def import_lines(self, lines, resume_after, skip_invalid, start):
+        """
+        Valide chaque ligne et insère les lignes valides par lots ; retourne le numéro de la dernière ligne
+        et le nombre de lignes invalides ignorées. Les lignes déjà importées (jusqu'à resume_after) sont relues
+        pour reconstruire les tables de correspondance, sans être insérées.
+        """
+        skipped = number = 0
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record, instance = self.read_row(json.loads(line))
+            except (ValueError, ValidationError) as error:
+                if number <= resume_after:
+                    continue
+                message = f"Ligne {number} : {self.format_error(error)}"
+                if not skip_invalid:
+                    raise CommandError(f"{message} Corriger la ligne puis relancer avec --resume.")
+                self.stderr.write(message)
+                skipped += 1
+                continue
+            if number <= resume_after:
+                continue
+            self.pending[record].append((number, instance))
+            self.pending_count += 1
+            if self.pending_count >= self.batch_size:
+                self.flush(number, start)
+        return number, skipped
+
+    def make_id(self, record, source_id):
+        """Clé primaire dérivée de l'identifiant d'origine : identique à chaque reprise de l'import."""
+        return uuid.uuid5(self.namespace, f'{record}:{source_id}')
+
+    def read_row(self, row):
+        """Valide la ligne et résout ses références ; retourne (type d'enregistrement, instance non enregistrée)."""
+        if not isinstance(row, dict) or row.get('record') not in IMPORT_RECORDS:
+            raise ValidationError(f"Type d'enregistrement attendu dans 'record' : {', '.join(IMPORT_RECORDS)}.")
+        record = row['record']
+        model, fields = IMPORT_RECORDS[record]
+
+        values, errors = {}, {}
+        for name in fields:
+            try:
+                values[name] = model._meta.get_field(name).clean(row.get(name), None)
+            except ValidationError as error:
+                errors[name] = error.messages
+        self.resolve_references(record, row, values, errors)
+        if record != 'contributor':
+            self.check_source_id(record, row, errors)
+        if errors:
+            raise ValidationError(errors)
+        return record, getattr(self, f'build_{record}')(row, values)
+
+    def resolve_references(self, record, row, values, errors):
+        """Clés étrangères de la ligne, lues dans les tables de correspondance (assigné : l'auteur par défaut)."""
+        model = IMPORT_RECORDS[record][0]
+        for key, (target, field) in IMPORT_REFERENCES.get(record, {}).items():
+            source_id = row.get(key)
+            if source_id is None and key == 'assigned':
+                source_id = row.get('author')
+            pk = self.ids[target].get(str(source_id))
+            if pk is None:
+                errors[key] = [f"{target} {source_id} inconnu (à importer sur une ligne précédente)."]
+            else:
+                values[model._meta.get_field(field).attname] = pk
+
+    def check_source_id(self, record, row, errors):
+        if row.get('id') is None:
+            errors['id'] = ["Identifiant d'origine obligatoire."]
+        elif str(row['id']) in self.ids[record]:
+            errors['id'] = [f"{record} {row['id']} déjà importé."]
+
+    def build_user(self, row, values):
+        email = CustomUser.objects.normalize_email(values['email'])
+        if email in self.emails:
+            raise ValidationError({'email': [f"Email {email} déjà importé."]})
+        self.emails.add(email)
+        values['email'] = email
+        user = CustomUser(user_id=self.make_id('user', row['id']), password=self.password, **values)
+        self.ids['user'][str(row['id'])] = user.pk
+        return user
+
+    def build_project(self, row, values):
+        project = Project(project_id=self.make_id('project', row['id']), **values)
+        self.ids['project'][str(row['id'])] = project.pk
+        return project
+
+    def build_contributor(self, row, values):
+        member = (values['project_id_id'], values['user_id_id'])
+        if member in self.members:
+            raise ValidationError(f"L'utilisateur {row['user']} est déjà contributeur du projet {row['project']}.")
+        self.members.add(member)
+        return Contributor(contributor_id=self.make_id('contributor', f"{row['project']}:{row['user']}"), **values)
+
+    def build_issue(self, row, values):
+        project_id = values['project_id_id']
+        errors = {
+            key: ["L'utilisateur ne fait pas partie des contributeurs du projet."]
+            for key, field in (('author', 'author_user_id_id'), ('assigned', 'assigned_user_id_id'))
+            if (project_id, values[field]) not in self.members
+        }
+        if errors:
+            raise ValidationError(errors)
+        issue = Issue(issue_id=self.make_id('issue', row['id']), **values)
+        self.ids['issue'][str(row['id'])] = issue.pk
+        self.issue_projects[issue.pk] = project_id
+        return issue
+
+    def build_comment(self, row, values):
+        if (self.issue_projects[values['issue_id_id']], values['author_user_id_id']) not in self.members:
+            raise ValidationError({'author': ["L'utilisateur ne fait pas partie des contributeurs du projet."]})
+        comment = Comment(comment_id=self.make_id('comment', row['id']), **values)
+        self.ids['comment'][str(row['id'])] = comment.pk
+        self.commented.add(values['issue_id_id'])
+        return comment
+
+    @staticmethod
+    def format_error(error):
+        if isinstance(error, ValidationError) and hasattr(error, 'error_dict'):
+            return ' | '.join(f"{name} : {' '.join(messages)}" for name, messages in error.message_dict.items())
+        if isinstance(error, ValidationError):
+            return ' '.join(error.messages)
+        return f"JSON invalide ({error})."
+
+    def flush(self, number, start):
+        """Insère le lot en attente dans une transaction (rejouée si la base est verrouillée) puis écrit la reprise."""
+        if not self.pending_count:
+            return
+        conflicts = retry_on_lock(self.insert_batch)()
+        self.write_checkpoint(number)
+        for record, rows in self.pending.items():
+            self.counts[record] += len(rows) - len(conflicts[record])
+            self.conflicts[record] += len(conflicts[record])
+            rows.clear()
+        self.report_conflicts(conflicts)
+        self.pending_count = 0
+        total = sum(self.counts.values())
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f"Ligne {number} : {total} lignes importées ({total / max(elapsed, 1e-9):.0f} lignes/s)")
+
+    def insert_batch(self):
+        """
+        Insère le lot dans l'ordre des clés étrangères ; retourne {type d'enregistrement: numéros des lignes ignorées}.
+        Les lignes en conflit (lot rejoué après une interruption entre la transaction et le point de reprise,
+        contributeur déjà présent) sont ignorées par bulk_create : les lignes insérées sont celles dont la clé
+        primaire est en base après l'insertion et ne l'était pas avant. Un email déjà utilisé par un autre
+        utilisateur interrompt l'import.
+        """
+        with transaction.atomic():
+            users = {user.email: user.pk for number, user in self.pending['user']}
+            taken = list(
+                CustomUser.objects.filter(email__in=users).exclude(pk__in=users.values())
+                .values_list('email', flat=True)
+            )
+            if taken:
+                raise CommandError(f"Emails déjà utilisés par d'autres utilisateurs : {', '.join(sorted(taken))}.")
+            conflicts = {}
+            for record, (model, fields) in IMPORT_RECORDS.items():
+                rows = self.pending[record]
+                pks = [instance.pk for number, instance in rows]
+                existing = self.existing_keys(model, pks)
+                model.objects.bulk_create([instance for number, instance in rows], ignore_conflicts=True)
+                inserted = self.existing_keys(model, pks) - existing
+                conflicts[record] = [number for number, instance in rows if instance.pk not in inserted]
+        return conflicts
+
+    @staticmethod
+    def existing_keys(model, pks):
+        """Clés primaires de pks présentes en base, lues par tranches (nombre de paramètres limité par SQLite)."""
+        size = connection.features.max_query_params or len(pks) or 1
+        keys = set()
+        for start in range(0, len(pks), size):
+            keys.update(model.objects.filter(pk__in=pks[start:start + size]).values_list('pk', flat=True))
+        return keys
+
+    def report_conflicts(self, conflicts):
+        """Signale les lignes du lot ignorées (numéros des lignes avec --verbosity 2)."""
+        for record, numbers in conflicts.items():
+            if not numbers:
+                continue
+            message = f"{record} : {len(numbers)} lignes déjà présentes en base ou en conflit ignorées"
+            if self.verbosity > 1:
+                message += f" (lignes {', '.join(map(str, numbers))})"
+            self.stderr.write(f"{message}.")
+
+    def read_checkpoint(self):
+        try:
+            with open(self.checkpoint, encoding='utf-8') as checkpoint:
+                return json.load(checkpoint)['line']
+        except FileNotFoundError:
+            return 0
+        except (ValueError, KeyError) as error:
+            raise CommandError(f"Point de reprise illisible ({self.checkpoint}) : {error}")
+
+    def write_checkpoint(self, number):
+        """Dernière ligne dont le lot est validé, écrite par remplacement atomique du fichier."""
+        temporary = f'{self.checkpoint}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as checkpoint:
+            json.dump({'line': number}, checkpoint)
+        os.replace(temporary, self.checkpoint)
+
+    def finalize(self):
+        """
+        Compteurs, versions (validateurs HTTP) et caches des projets et problèmes importés :
+        bulk_create ne déclenche pas les signaux de projects.signals.
+        """
+        issues = sorted(self.commented)
+        for start in range(0, len(issues), self.batch_size):
+            with transaction.atomic():
+                Issue.bump_comments_version(*issues[start:start + self.batch_size])
+                Issue.reconcile_counters(*issues[start:start + self.batch_size])
+
+        projects = sorted(self.ids['project'].values())
+        for start in range(0, len(projects), self.batch_size):
+            with transaction.atomic():
+                Project.reconcile_counters(*projects[start:start + self.batch_size])
+                Project.bump_version(*projects[start:start + self.batch_size], touch=True)
+        for project_id in projects:
+            membership_cache.invalidate_project(project_id)
+            stats_cache.invalidate(project_id)
@@ -0,0 +1,172 @@
+import bisect
+import itertools
+import random
+import time
+import uuid
+from array import array
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apis.scenarios import SCENARIO_PASSWORD
+from projects.models import Project, Contributor, Issue, Comment
+
+CustomUser = get_user_model()
+
+
+def zipf_cum_weights(size, exponent):
+    """Poids cumulés d'une loi de Zipf : quelques éléments concentrent l'essentiel de l'activité."""
+    return list(itertools.accumulate(1 / (rank ** exponent) for rank in range(1, size + 1)))
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère un volume configurable d'utilisateurs, projets, contributeurs, problèmes et commentaires "
+        "par insertions groupées (bulk_create), avec une activité concentrée sur quelques projets. "
+        f"Mot de passe des utilisateurs générés : {SCENARIO_PASSWORD}"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--projects', type=int, default=100)
+        parser.add_argument('--issues', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=50000)
+        parser.add_argument('--max-contributors', type=int, default=50,
+                            help="Nombre maximal de contributeurs par projet (auteur compris).")
+        parser.add_argument('--skew', type=float, default=1.1, help="Exposant de la loi de Zipf de l'activité.")
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.skew = options['skew']
+        start = time.perf_counter()
+
+        users = self.create_users(options['users'])
+        projects, members = self.create_projects(users, options['projects'], options['max_contributors'])
+        issue_ids, issue_projects = self.create_issues(projects, members, options['issues'])
+        self.create_comments(issue_ids, issue_projects, members, options['comments'])
+        self.count_projects(projects)
+
+        self.stdout.write(self.style.SUCCESS(f"Données générées en {time.perf_counter() - start:.1f} s."))
+
+    def bulk_insert(self, model, objects):
+        """Insère les objets par lots, chaque lot dans sa propre transaction."""
+        total = 0
+        start = time.perf_counter()
+        for batch in iter(lambda: list(itertools.islice(objects, self.batch_size)), []):
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            total += len(batch)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f"{model.__name__}: {total} lignes ({total / max(elapsed, 1e-9):.0f} lignes/s)")
+
+    def count_projects(self, projects):
+        """Calcule les compteurs des projets générés (bulk_create ne déclenche pas les signaux)."""
+        for start in range(0, len(projects), self.batch_size):
+            with transaction.atomic():
+                Project.reconcile_counters(*projects[start:start + self.batch_size])
+
+    def create_users(self, count):
+        password = make_password(SCENARIO_PASSWORD)
+        prefix = uuid.uuid4().hex[:8]
+        users = [uuid.uuid4() for _ in range(count)]
+        self.bulk_insert(CustomUser, (
+            CustomUser(user_id=user_id, email=f'seed-{prefix}-{index}@example.com', first_name='Utilisateur',
+                       last_name='Généré', password=password)
+            for index, user_id in enumerate(users)
+        ))
+        return users
+
+    def create_projects(self, users, count, max_contributors):
+        """Crée les projets et leurs contributeurs ; retourne les projets et la liste des membres de chacun."""
+        projects = [uuid.uuid4() for _ in range(count)]
+        types = [choice for choice, _ in Project.PROJECT_TYPE]
+        self.bulk_insert(Project, (
+            Project(project_id=project_id, title=f'Projet {index}', description='Projet généré',
+                    type=self.random.choice(types))
+            for index, project_id in enumerate(projects)
+        ))
+
+        cum_weights = zipf_cum_weights(len(users), self.skew)
+        members = []
+        for _ in projects:
+            size = min(max_contributors, len(users), 1 + int(self.random.paretovariate(1.5)))
+            chosen = set()
+            while len(chosen) < size:
+                chosen.add(self.pick(cum_weights))
+            members.append([users[index] for index in chosen])
+
+        self.bulk_insert(Contributor, (
+            Contributor(permission='AUTHOR' if position == 0 else 'ASSIGNED',
+                        role='Propriétaire' if position == 0 else 'Développeur',
+                        user_id_id=user_id, project_id_id=project_id)
+            for project_id, project_members in zip(projects, members)
+            for position, user_id in enumerate(project_members)
+        ))
+        return projects, members
+
+    def create_issues(self, projects, members, count):
+        """Crée les problèmes, concentrés sur les projets les plus actifs ; retourne leurs ids compacts."""
+        cum_weights = zipf_cum_weights(len(projects), self.skew)
+        issue_ids = bytearray()
+        issue_projects = array('I')
+        tags = [choice for choice, _ in Issue.TAG]
+        priorities = [choice for choice, _ in Issue.PRIORITY]
+        statuses = [choice for choice, _ in Issue.STATUS]
+
+        def issues():
+            for index in range(count):
+                project_index = self.pick(cum_weights)
+                issue_id = uuid.uuid4()
+                issue_ids.extend(issue_id.bytes)
+                issue_projects.append(project_index)
+                project_members = members[project_index]
+                yield Issue(
+                    issue_id=issue_id, title=f'Problème {index}', description='Problème généré',
+                    tag=self.random.choice(tags), priority=self.random.choice(priorities),
+                    status=self.random.choice(statuses), project_id_id=projects[project_index],
+                    author_user_id_id=self.random.choice(project_members),
+                    assigned_user_id_id=self.random.choice(project_members),
+                )
+
+        self.bulk_insert(Issue, issues())
+        return issue_ids, issue_projects
+
+    def create_comments(self, issue_ids, issue_projects, members, count):
+        """Crée les commentaires, concentrés sur une minorité de problèmes."""
+        issue_count = len(issue_projects)
+        if not issue_count:
+            return
+        cum_weights = zipf_cum_weights(issue_count, self.skew)
+        ranks = list(range(issue_count))
+        self.random.shuffle(ranks)
+
+        commented = set()
+
+        def issue_id(issue_index):
+            return uuid.UUID(bytes=bytes(issue_ids[issue_index * 16:issue_index * 16 + 16]))
+
+        def comments():
+            for index in range(count):
+                issue_index = ranks[self.pick(cum_weights)]
+                commented.add(issue_index)
+                yield Comment(
+                    description=f'Commentaire {index}',
+                    issue_id_id=issue_id(issue_index),
+                    author_user_id_id=self.random.choice(members[issue_projects[issue_index]]),
+                )
+
+        self.bulk_insert(Comment, comments())
+
+        # Nombre de commentaires des problèmes commentés (bulk_create ne déclenche pas les signaux).
+        commented = [issue_id(issue_index) for issue_index in sorted(commented)]
+        for start in range(0, len(commented), self.batch_size):
+            with transaction.atomic():
+                Issue.reconcile_counters(*commented[start:start + self.batch_size])
+
+    def pick(self, cum_weights):
+        return bisect.bisect(cum_weights, self.random.random() * cum_weights[-1])
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from helpers.routing import get_replica_options, sync_replica
+
+
+class Command(BaseCommand):
+    help = (
+        "Copie la base 'default' dans le fichier de la réplique en lecture (DATABASE_REPLICA['NAME'], MODE 'backup') "
+        "par l'API de sauvegarde SQLite, par exemple avant le démarrage des serveurs ou depuis une tâche planifiée."
+    )
+
+    def handle(self, *args, **options):
+        if get_replica_options()['MODE'] != 'backup':
+            raise CommandError("DATABASE_REPLICA['MODE'] n'est pas 'backup' : la réplique lit la base principale.")
+        duration = sync_replica()
+        self.stdout.write(self.style.SUCCESS(f"Réplique synchronisée en {duration:.3f} s."))
@@ -0,0 +1,189 @@
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework import pagination
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class LimitOffsetPagination(pagination.LimitOffsetPagination):
+    """LimitOffsetPagination de DRF, avec une version asynchrone (apaginate_queryset) pour les vues asynchrones."""
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.count = await queryset.acount()
+        self.offset = self.get_offset(request)
+        self.request = request
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+
+        if self.count == 0 or self.offset > self.count:
+            return []
+        return [item async for item in queryset[self.offset:self.offset + self.limit]]
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pagination par curseur opaque sur (created_at, pk), dans l'ordre décroissant de TrackingModel.Meta.ordering,
+    ou sur le champ désigné par l'attribut keyset_field de la vue (ex. last_activity_at).
+    Le coût d'une page ne dépend pas de sa profondeur, aucun COUNT n'est exécuté
+    et les pages restent stables pendant l'insertion de nouvelles lignes.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Curseur invalide.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request, view)
+        return self.paginate_results(list(queryset[:self.limit + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request, view)
+        return self.paginate_results([item async for item in queryset[:self.limit + 1]])
+
+    def page_queryset(self, queryset, request, view=None):
+        """Filtre et ordonne le queryset à partir du curseur ; la page est lue sur page_size + 1 lignes."""
+        self.request = request
+        self.field = field = getattr(view, 'keyset_field', 'created_at')
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_page_size(request)
+        self.position = position = self.decode_cursor(request)
+        pk_name = queryset.model._meta.pk.name
+
+        if position is None:
+            reverse = False
+        else:
+            value, pk, reverse = position
+            if reverse:
+                queryset = queryset.filter(
+                    Q(**{f'{field}__gt': value}) | Q(**{field: value, f'{pk_name}__gt': pk})
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(**{f'{field}__lt': value}) | Q(**{field: value, f'{pk_name}__lt': pk})
+                )
+
+        self.reverse = reverse
+        if reverse:
+            return queryset.order_by(field, pk_name)
+        return queryset.order_by(f'-{field}', f'-{pk_name}')
+
+    def paginate_results(self, results):
+        page_size = self.limit
+        has_more = len(results) > page_size
+        results = results[:page_size]
+
+        if self.reverse:
+            results.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, self.position is not None
+
+        self.next_item = results[-1] if results and has_next else None
+        self.previous_item = results[0] if results and has_previous else None
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self):
+        if self.next_item is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(self.next_item, False))
+
+    def get_previous_link(self):
+        if self.previous_item is None:
+            return None
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_cursor(self.previous_item, True)
+        )
+
+    def encode_cursor(self, item, reverse):
+        payload = {'c': getattr(item, self.field).isoformat(), 'k': str(item.pk), 'r': reverse}
+        if self.field != 'created_at':
+            payload['f'] = self.field
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def decode_cursor(self, request):
+        """Retourne (date du champ, pk, reverse) ou None pour la première page (curseur d'un autre tri refusé)."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            value = parse_datetime(payload['c'])
+            position = (value, payload['k'], bool(payload['r']))
+            field = payload.get('f', 'created_at')
+        except (binascii.Error, ValueError, KeyError, TypeError, AttributeError):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None or field != self.field:
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+
+class SelectablePagination(BasePagination):
+    """
+    Pagination par décalage (LimitOffsetPagination) ou par curseur (KeysetPagination).
+    Le mode est choisi par le paramètre ?pagination=offset|cursor, par la présence d'un ?cursor=,
+    ou à défaut par l'attribut pagination_mode de la vue ('offset' par défaut).
+    """
+
+    mode_query_param = 'pagination'
+    paginator_classes = {
+        'offset': LimitOffsetPagination,
+        'cursor': KeysetPagination,
+    }
+
+    def get_mode(self, request, view):
+        mode = request.query_params.get(self.mode_query_param)
+        if mode in self.paginator_classes:
+            return mode
+        if request.query_params.get(KeysetPagination.cursor_query_param):
+            return 'cursor'
+        return getattr(view, 'pagination_mode', 'offset')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.paginator_classes[self.get_mode(request, view)]()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.paginator_classes[self.get_mode(request, view)]()
+        return await self.paginator.apaginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
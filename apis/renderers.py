@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # orjson est optionnel : rendu par le JSONRenderer de DRF
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encodé par orjson, octet pour octet identique à celui de DRF (séparateurs compacts, UTF-8,
+    U+2028 et U+2029 échappés) pour les données sans nombres décimaux ni dates non converties :
+    réservé aux vues dont les serializers ne rendent que des chaînes, entiers, booléens et UUID.
+    Sans orjson, ou avec une indentation demandée, le rendu est celui de DRF.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None or not self.compact or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        encoder = self.encoder_class()
+        ret = orjson.dumps(data, default=encoder.default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+FAST_RENDERER_CLASSES = [
+    FastJSONRenderer if renderer is JSONRenderer else renderer for renderer in api_settings.DEFAULT_RENDERER_CLASSES
+]
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    JSON délimité par des lignes (un objet par ligne) des exports de apis.export, choisi par l'en-tête Accept
+    ou ?format=ndjson. Les exports sont diffusés ligne à ligne par la vue ; ce rendu sert aux réponses d'erreur.
+    """
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        line = json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+        return (line + '\n').encode(self.charset)
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    CSV des exports de apis.export (un type d'enregistrement par fichier), choisi par l'en-tête Accept
+    ou ?format=csv. Les réponses d'erreur sont rendues en une ligne d'en-tête et une ligne de valeurs.
+    """
+
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not isinstance(data, dict):
+            data = {'detail': data}
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(data)
+        writer.writerow(
+            value if isinstance(value, str) else json.dumps(value, cls=JSONEncoder, ensure_ascii=False)
+            for value in data.values()
+        )
+        return output.getvalue().encode(self.charset)
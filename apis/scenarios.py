@@ -0,0 +1,118 @@
+from collections import namedtuple
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+from projects.models import Project, Contributor, Issue, Comment
+
+CustomUser = get_user_model()
+
+RouteCall = namedtuple('RouteCall', ('name', 'method', 'path', 'data', 'user'))
+
+SCENARIO_PASSWORD = 'Scenario-password-2023'
+
+
+def seed_scenario(size):
+    """
+    Crée un jeu de données de taille `size` : un auteur contribuant à `size` projets,
+    `size` contributeurs, `size` problèmes sur le premier projet et `size` commentaires sur le premier problème.
+    """
+    password = make_password(SCENARIO_PASSWORD)
+    users = CustomUser.objects.bulk_create([
+        CustomUser(email=f'scenario{index}@example.com', first_name='Scenario', last_name='Utilisateur',
+                   password=password)
+        for index in range(size + 2)
+    ])
+    author, outsider, contributors = users[0], users[1], users[2:]
+
+    projects = Project.objects.bulk_create([
+        Project(title=f'Projet {index}', description='Description', type='BACK-END') for index in range(size)
+    ])
+    project = projects[0]
+    Contributor.objects.bulk_create(
+        [Contributor(permission='AUTHOR', role='Propriétaire', user_id=author, project_id=item) for item in projects]
+        + [Contributor(permission='ASSIGNED', role='Développeur', user_id=user, project_id=project)
+           for user in contributors]
+    )
+    issues = Issue.objects.bulk_create([
+        Issue(title=f'Problème {index}', description='Description', tag='BUG', priority='HIGH', status='TODO',
+              author_user_id=author, assigned_user_id=contributors[index % len(contributors)], project_id=project)
+        for index in range(size)
+    ])
+    Project.reconcile_counters(*[item.pk for item in projects])
+    issue = issues[0]
+    comments = Comment.objects.bulk_create([
+        Comment(description=f'Commentaire {index}', author_user_id=author, issue_id=issue) for index in range(size)
+    ])
+    Issue.reconcile_counters(issue.pk)
+    return SimpleNamespace(
+        author=author, outsider=outsider, contributor=contributors[0], project=project, issue=issue,
+        comment=comments[0], issue_author=author, comment_author=author, password=SCENARIO_PASSWORD,
+        batch_size=size,
+    )
+
+
+def build_route_calls(data):
+    """
+    Retourne un appel représentatif par route et par méthode de apis/urls.py.
+    `data` fournit l'auteur et un contributeur du projet, un utilisateur extérieur au projet,
+    le projet, un problème et un commentaire de ce problème ainsi que leurs auteurs,
+    et la taille des lots des routes de création groupée.
+    """
+    project_url = f'/projects/{data.project.project_id}/'
+    issue_url = f'{project_url}issues/{data.issue.issue_id}/'
+    comment_url = f'{issue_url}comments/{data.comment.comment_id}/'
+    project_data = {'title': 'Projet modifié', 'description': 'Description', 'type': 'IOS'}
+    issue_data = {
+        'title': 'Problème', 'description': 'Description', 'tag': 'TASK', 'priority': 'WEAK', 'status': 'TODO',
+        'assigned_user_id': str(data.contributor.user_id),
+    }
+    return [
+        RouteCall('signup', 'post', '/signup/', {
+            'email': 'nouveau@example.com', 'first_name': 'Nouveau', 'last_name': 'Utilisateur',
+            'password': SCENARIO_PASSWORD, 'password2': SCENARIO_PASSWORD,
+        }, None),
+        RouteCall('login', 'post', '/login/', {'email': data.author.email, 'password': data.password}, None),
+        RouteCall('projects', 'get', '/projects/', None, data.author),
+        RouteCall('projects', 'post', '/projects/', project_data, data.author),
+        RouteCall('project_detail', 'get', project_url, None, data.author),
+        RouteCall('project_detail', 'put', project_url, project_data, data.author),
+        RouteCall('project_detail', 'delete', project_url, None, data.author),
+        RouteCall('contributors', 'get', f'{project_url}users/', None, data.author),
+        RouteCall('contributors', 'post', f'{project_url}users/', {
+            'role': 'Testeur', 'user_id': {'user_id': str(data.outsider.user_id)},
+        }, data.author),
+        RouteCall('contributors_batch', 'post', f'{project_url}users/batch/', {
+            'add': [{'user': data.outsider.email, 'role': 'Développeur'}],
+            'remove': [str(data.contributor.user_id)],
+        }, data.author),
+        RouteCall('delete_contributor', 'delete', f'{project_url}users/{data.contributor.user_id}/', None,
+                  data.author),
+        RouteCall('issues', 'get', f'{project_url}issues/', None, data.contributor),
+        RouteCall('issues', 'post', f'{project_url}issues/', issue_data, data.contributor),
+        RouteCall('issues (lot)', 'post', f'{project_url}issues/', [issue_data] * data.batch_size, data.contributor),
+        RouteCall('search', 'get', f'{project_url}search/', {'q': 'problème commentaire'}, data.contributor),
+        RouteCall('stats', 'get', f'{project_url}stats/', None, data.contributor),
+        RouteCall('export', 'get', f'{project_url}export/', None, data.contributor),
+        RouteCall('issue', 'get', issue_url, None, data.issue_author),
+        RouteCall('issue', 'put', issue_url, issue_data, data.issue_author),
+        RouteCall('issue', 'delete', issue_url, None, data.issue_author),
+        RouteCall('comments', 'get', f'{issue_url}comments/', None, data.contributor),
+        RouteCall('comments', 'post', f'{issue_url}comments/', {'description': 'Nouveau commentaire'},
+                  data.contributor),
+        RouteCall('comment', 'get', comment_url, None, data.comment_author),
+        RouteCall('comment', 'put', comment_url, {'description': 'Commentaire modifié'}, data.comment_author),
+        RouteCall('comment', 'delete', comment_url, None, data.comment_author),
+    ]
+
+
+def call_route(client, call):
+    """
+    Exécute l'appel avec le client de test et lit tout le corps de la réponse : le contenu d'une réponse
+    en flux (export) n'est produit, et ses requêtes exécutées, qu'à la lecture.
+    """
+    response = getattr(client, call.method)(call.path, call.data, format='json')
+    if response.streaming:
+        b''.join(response.streaming_content)
+    return response
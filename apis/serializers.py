@@ -1,13 +1,122 @@
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth import get_user_model
-from rest_framework import serializers
+from rest_framework import permissions, serializers
 
+from helpers.metrics import timed
+from helpers.validators import ischarfieldvalidator
 from projects.models import Project, Contributor, Issue, Comment
 
 CustomUser = get_user_model()
 
 
-class SignupSerializer(serializers.ModelSerializer):
+class TimedListSerializer(serializers.ListSerializer):
+    """ListSerializer dont le rendu est mesuré par l'instrumentation des requêtes (étape 'serializer')."""
+
+    @property
+    def data(self):
+        with timed('serializer'):
+            return super().data
+
+
+class TimedSerializerMixin:
+    """Mesure le rendu du serializer racine par l'instrumentation des requêtes (étape 'serializer')."""
+
+    @property
+    def data(self):
+        with timed('serializer'):
+            return super().data
+
+
+def parse_shape(query_params):
+    """
+    Retourne la forme demandée par ?fields=a,b et ?expand=x,x.y : (champs ou None, arbre des expansions),
+    ou None si aucun des deux paramètres n'est renseigné (représentation complète historique).
+    """
+    fields = [name for name in query_params.get('fields', '').split(',') if name]
+    paths = [path for path in query_params.get('expand', '').split(',') if path]
+    if not fields and not paths:
+        return None
+    expand = {}
+    for path in paths:
+        node = expand
+        for name in path.split('.'):
+            node = node.setdefault(name, {})
+    return fields or None, expand
+
+
+def get_request_shape(request):
+    """Forme demandée par la requête de lecture, None pour les écritures ou sans ?fields= ni ?expand=."""
+    if request is None or request.method not in permissions.SAFE_METHODS:
+        return None
+    return parse_shape(request.query_params)
+
+
+class SparseFieldsMixin:
+    """
+    Champs limités par ?fields= et objets imbriqués réduits à leur clé primaire sauf s'ils sont demandés
+    par ?expand= (chemins pointés pour les niveaux suivants). Sans ces paramètres, la représentation
+    complète est conservée. La forme peut aussi être passée au constructeur (fields, expand).
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._shape = (fields, expand) if fields is not None or expand is not None else None
+
+    def get_shape(self):
+        if self._shape is not None:
+            return self._shape
+        parent = self.parent.parent if isinstance(self.parent, serializers.ListSerializer) else self.parent
+        if parent is not None:
+            return None
+        return get_request_shape(self.context.get('request'))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        shape = self.get_shape()
+        if shape is None:
+            return fields
+
+        requested, expand = shape
+        expand = expand or {}
+        shaped = {}
+        for name, field in fields.items():
+            if requested is not None and name not in requested:
+                continue
+            if isinstance(field, serializers.BaseSerializer):
+                if name in expand and isinstance(field, SparseFieldsMixin):
+                    field = type(field)(read_only=True, expand=expand[name])
+                elif name not in expand:
+                    field = serializers.PrimaryKeyRelatedField(read_only=True, source=field.source)
+            shaped[name] = field
+        return shaped
+
+
+def related_lookups(serializer, model, prefix=''):
+    """
+    Jointures (select_related) et préchargements (prefetch_related) nécessaires au rendu du serializer
+    tel qu'il est configuré : objets imbriqués développés, relations rendues par str() et listes de clés.
+    """
+    select, prefetch = [], []
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+        model_field = model._meta.get_field(field.source_attrs[0])
+        if not model_field.is_relation:
+            continue
+        path = prefix + field.source_attrs[0]
+        if model_field.many_to_many or model_field.one_to_many:
+            prefetch.append(path)
+        elif isinstance(field, serializers.BaseSerializer):
+            select.append(path)
+            nested_select, nested_prefetch = related_lookups(field, model_field.related_model, f'{path}__')
+            select += nested_select
+            prefetch += nested_prefetch
+        elif not isinstance(field, serializers.RelatedField):
+            select.append(path)
+    return select, prefetch
+
+
+class SignupSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer utilisé pour l'inscription du customuser."""
 
     password = serializers.CharField(
@@ -42,22 +151,28 @@ class SignupSerializer(serializers.ModelSerializer):
         return CustomUser.objects.create_user(**validated_data)
 
 
-class ProjectListSerializer(serializers.ModelSerializer):
+class ProjectListSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer du projet intégrant les informations minimales."""
 
     class Meta:
         model = Project
+        list_serializer_class = TimedListSerializer
         fields = (
             'created_at',
             'updated_at',
             'project_id',
             'title',
-            'type'
+            'type',
+            'issue_count',
+            'todo_issue_count',
+            'ongoing_issue_count',
+            'ended_issue_count',
+            'contributor_count'
         )
         read_only__fields = ('project_id')
 
 
-class ProjectDetailSerializer(serializers.ModelSerializer):
+class ProjectDetailSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer intégrant toutes les informations du projet."""
 
     class Meta:
@@ -74,7 +189,7 @@ class ProjectDetailSerializer(serializers.ModelSerializer):
         read_only__fields = ('project_id')
 
 
-class CustomUserSerializer(serializers.ModelSerializer):
+class CustomUserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer du customuser intégrant les informations minimales."""
 
     class Meta:
@@ -88,13 +203,14 @@ class CustomUserSerializer(serializers.ModelSerializer):
         )
 
 
-class ContributorSerializer(serializers.ModelSerializer):
+class ContributorSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer du contributeur intégrant les informations minimales de l'utilisateur."""
 
     user_id = CustomUserSerializer(read_only=True)
 
     class Meta:
         model = Contributor
+        list_serializer_class = TimedListSerializer
         fields = (
             'created_at',
             'contributor_id',
@@ -103,7 +219,29 @@ class ContributorSerializer(serializers.ModelSerializer):
         )
 
 
-class ProjectContributorsSerializer(serializers.ModelSerializer):
+class ContributorBatchAddSerializer(serializers.Serializer):
+    """Contributeur à ajouter au lot : utilisateur désigné par son user_id ou son email, et son rôle."""
+
+    user = serializers.CharField(max_length=254)
+    role = serializers.CharField(max_length=128, validators=[ischarfieldvalidator])
+
+
+class ContributorBatchSerializer(serializers.Serializer):
+    """Lot d'ajouts et de retraits de contributeurs (utilisateurs désignés par user_id ou email)."""
+
+    add = serializers.ListField(child=ContributorBatchAddSerializer(), required=False, default=list)
+    remove = serializers.ListField(child=serializers.CharField(max_length=254), required=False, default=list)
+
+    def validate(self, data):
+        if not data['add'] and not data['remove']:
+            raise serializers.ValidationError("Le lot ne contient aucun contributeur à ajouter ou retirer.")
+        max_size = self.context.get('max_size')
+        if max_size is not None and len(data['add']) + len(data['remove']) > max_size:
+            raise serializers.ValidationError(f"Le lot ne peut pas dépasser {max_size} éléments.")
+        return data
+
+
+class ProjectContributorsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer minimal du projet intégré aux problèmes."""
 
     class Meta:
@@ -114,7 +252,7 @@ class ProjectContributorsSerializer(serializers.ModelSerializer):
         )
 
 
-class IssueSerializer(serializers.ModelSerializer):
+class IssueSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer du problème.
     Assigne l'utilisateur-auteur par défaut (utilisateur connecté).
@@ -132,6 +270,7 @@ class IssueSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Issue
+        list_serializer_class = TimedListSerializer
         fields = (
             'created_at',
             'updated_at',
@@ -143,12 +282,14 @@ class IssueSerializer(serializers.ModelSerializer):
             'status',
             'author_user_id',
             'project_id',
-            'assigned_user_id'
+            'assigned_user_id',
+            'comment_count',
+            'last_activity_at'
         )
         read_only_fields = ('issue_id', 'author_user_id')
 
 
-class CommentIssueSerializer(serializers.ModelSerializer):
+class CommentIssueSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer minimal du problème intégré aux commentaires."""
 
     project_id = ProjectContributorsSerializer(read_only=True)
@@ -165,7 +306,7 @@ class CommentIssueSerializer(serializers.ModelSerializer):
         read_only_fields = ('issue_id', 'author_user_id')
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer du commentaire.
     Assigne l'utilisateur-auteur par défaut (utilisateur connecté).
@@ -179,6 +320,7 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
+        list_serializer_class = TimedListSerializer
         fields = (
             'created_at',
             'updated_at',
@@ -0,0 +1,203 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts import hashers
+from accounts.authentication import user_cache
+from projects.membership import membership_cache
+from projects.stats import stats_cache
+from .scenarios import SCENARIO_PASSWORD, seed_scenario, build_route_calls, call_route
+
+CustomUser = get_user_model()
+
+# Tailles des jeux de données : le nombre de requêtes d'une route ne dépend ni de la taille des pages
+# ni du nombre d'objets imbriqués.
+SIZES = (2, 8)
+
+# Nombre de requêtes SQL attendu par route et par méthode (voir aussi la commande check_query_counts).
+EXPECTED_QUERIES = {
+    'POST signup': 2,
+    'POST login': 2,
+    'GET projects': 3,
+    'POST projects': 5,
+    'GET project_detail': 3,
+    'PUT project_detail': 4,
+    'DELETE project_detail': 8,
+    'GET contributors': 5,
+    'POST contributors': 6,
+    'POST contributors_batch': 11,
+    'DELETE delete_contributor': 5,
+    'GET issues': 6,
+    'POST issues': 5,
+    'POST issues (lot)': 8,
+    'GET search': 3,
+    'GET stats': 3,
+    'GET export': 7,
+    'GET issue': 4,
+    'PUT issue': 7,
+    'DELETE issue': 7,
+    'GET comments': 6,
+    'POST comments': 9,
+    'GET comment': 4,
+    'PUT comment': 7,
+    'DELETE comment': 7,
+}
+
+
+class RouteQueryCountTests(TestCase):
+    """
+    Nombre de requêtes SQL de chaque route de apis/urls.py, appelée avec les données de apis/scenarios.py
+    pour chacune des tailles de SIZES, caches vidés.
+    """
+
+    def assertRouteQueries(self, route):
+        for size in SIZES:
+            with self.subTest(size=size), transaction.atomic():
+                calls = {
+                    f'{call.method.upper()} {call.name}': call for call in build_route_calls(seed_scenario(size))
+                }
+                call = calls[route]
+                client = APIClient()
+                if call.user is not None:
+                    client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(call.user)}')
+                membership_cache.clear()
+                user_cache.clear()
+                stats_cache.clear()
+
+                with self.assertNumQueries(EXPECTED_QUERIES[route]):
+                    response = call_route(client, call)
+                self.assertLess(response.status_code, 400, response)
+                transaction.set_rollback(True)
+
+    def test_every_route_is_counted(self):
+        calls = build_route_calls(seed_scenario(1))
+        self.assertEqual(sorted(f'{call.method.upper()} {call.name}' for call in calls), sorted(EXPECTED_QUERIES))
+
+    def test_signup(self):
+        self.assertRouteQueries('POST signup')
+
+    def test_login(self):
+        self.assertRouteQueries('POST login')
+
+    def test_projects_list(self):
+        self.assertRouteQueries('GET projects')
+
+    def test_projects_create(self):
+        self.assertRouteQueries('POST projects')
+
+    def test_project_retrieve(self):
+        self.assertRouteQueries('GET project_detail')
+
+    def test_project_update(self):
+        self.assertRouteQueries('PUT project_detail')
+
+    def test_project_delete(self):
+        self.assertRouteQueries('DELETE project_detail')
+
+    def test_contributors_list(self):
+        self.assertRouteQueries('GET contributors')
+
+    def test_contributors_create(self):
+        self.assertRouteQueries('POST contributors')
+
+    def test_contributors_batch(self):
+        self.assertRouteQueries('POST contributors_batch')
+
+    def test_contributor_delete(self):
+        self.assertRouteQueries('DELETE delete_contributor')
+
+    def test_issues_list(self):
+        self.assertRouteQueries('GET issues')
+
+    def test_issues_create(self):
+        self.assertRouteQueries('POST issues')
+
+    def test_issues_create_many(self):
+        self.assertRouteQueries('POST issues (lot)')
+
+    def test_search(self):
+        self.assertRouteQueries('GET search')
+
+    def test_stats(self):
+        self.assertRouteQueries('GET stats')
+
+    def test_export(self):
+        self.assertRouteQueries('GET export')
+
+    def test_issue_retrieve(self):
+        self.assertRouteQueries('GET issue')
+
+    def test_issue_update(self):
+        self.assertRouteQueries('PUT issue')
+
+    def test_issue_delete(self):
+        self.assertRouteQueries('DELETE issue')
+
+    def test_comments_list(self):
+        self.assertRouteQueries('GET comments')
+
+    def test_comments_create(self):
+        self.assertRouteQueries('POST comments')
+
+    def test_comment_retrieve(self):
+        self.assertRouteQueries('GET comment')
+
+    def test_comment_update(self):
+        self.assertRouteQueries('PUT comment')
+
+    def test_comment_delete(self):
+        self.assertRouteQueries('DELETE comment')
+
+
+@override_settings(ROOT_URLCONF='apis.async_urls')
+class AsyncAuthTests(TestCase):
+    """Inscription et connexion asynchrones (ASGI) : hachages dans le pool borné, réponses de la vue synchrone."""
+
+    signup_data = {
+        'email': 'asynchrone@example.com', 'first_name': 'Nouveau', 'last_name': 'Utilisateur',
+        'password': SCENARIO_PASSWORD, 'password2': SCENARIO_PASSWORD,
+    }
+    login_data = {'email': 'asynchrone@example.com', 'password': SCENARIO_PASSWORD}
+
+    def post(self, path, data):
+        return async_to_sync(self.async_client.post)(path, data, content_type='application/json')
+
+    def post_sync(self, path, data):
+        with override_settings(ROOT_URLCONF='apis.urls'):
+            return APIClient().post(path, data, format='json')
+
+    def test_signup_hashes_once_in_pool(self):
+        with mock.patch.object(hashers, 'get_hashing_executor', wraps=hashers.get_hashing_executor) as executor:
+            response = self.post('/signup/', self.signup_data)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(executor.call_count, 1)
+        self.assertTrue(CustomUser.objects.get(email='asynchrone@example.com').check_password(SCENARIO_PASSWORD))
+
+    def test_login_rehashes_in_pool(self):
+        with override_settings(PASSWORD_HASHING={'PROFILE': 'fast'}):
+            self.post('/signup/', self.signup_data)
+        response = self.post('/login/', self.login_data)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(sorted(response.json()), ['access', 'refresh'])
+        password = CustomUser.objects.get(email='asynchrone@example.com').password
+        self.assertTrue(password.startswith(f'pbkdf2_sha256${hashers.HASHER_PROFILES["standard"]}$'))
+
+    def test_errors_match_sync_views(self):
+        self.post('/signup/', self.signup_data)
+        cases = [
+            ('/signup/', self.signup_data),
+            ('/signup/', dict(self.signup_data, email='autre@example.com', password2='Autre-mot-de-passe-2023')),
+            ('/login/', {}),
+            ('/login/', dict(self.login_data, password='mauvais')),
+            ('/login/', dict(self.login_data, email='inconnu@example.com')),
+        ]
+        for path, data in cases:
+            with self.subTest(path=path, data=data):
+                response, expected = self.post(path, data), self.post_sync(path, data)
+                self.assertEqual((response.status_code, response.content), (expected.status_code, expected.content))
+                self.assertEqual(response.get('WWW-Authenticate'), expected.get('WWW-Authenticate'))
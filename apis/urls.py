@@ -1,30 +1,38 @@
 from django.urls import path
-from rest_framework_simplejwt.views import TokenObtainPairView
 
 from .views import (
     SignupAPIView,
+    LoginAPIView,
     ProjectListAPIView,
     ProjectDetailAPIView,
     ContributorsAPIView,
     ContributorDeleteAPIView,
+    ContributorsBatchAPIView,
     IssuesAPIView,
     IssueAPIView,
     CommentsAPIView,
-    CommentAPIView
+    CommentAPIView,
+    SearchAPIView,
+    ProjectStatsAPIView,
+    ProjectExportAPIView
 )
 
 urlpatterns = [
     path('signup/', SignupAPIView.as_view(), name='signup'),
-    path('login/', TokenObtainPairView.as_view(), name='login'),
+    path('login/', LoginAPIView.as_view(), name='login'),
     path('projects/', ProjectListAPIView.as_view(), name='projects'),
     path('projects/<uuid:project_id>/', ProjectDetailAPIView.as_view(), name='project_detail'),
     path('projects/<uuid:project_id>/users/', ContributorsAPIView.as_view(), name='contributors'),
+    path('projects/<uuid:project_id>/users/batch/', ContributorsBatchAPIView.as_view(), name='contributors_batch'),
     path(
             'projects/<uuid:project_id>/users/<uuid:user_id>/',
             ContributorDeleteAPIView.as_view(),
             name='delete_contributor'
         ),
     path('projects/<uuid:project_id>/issues/', IssuesAPIView.as_view(), name='issues'),
+    path('projects/<uuid:project_id>/search/', SearchAPIView.as_view(), name='search'),
+    path('projects/<uuid:project_id>/stats/', ProjectStatsAPIView.as_view(), name='stats'),
+    path('projects/<uuid:project_id>/export/', ProjectExportAPIView.as_view(), name='export'),
     path(
             'projects/<uuid:project_id>/issues/<uuid:issue_id>/',
             IssueAPIView.as_view(),
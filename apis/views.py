@@ -1,26 +1,125 @@
-import datetime
+import uuid
+from django.db import router, transaction
+from django.db.models import Q, prefetch_related_objects
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.generics import CreateAPIView, ListCreateAPIView, RetrieveUpdateDestroyAPIView, DestroyAPIView
-from rest_framework.permissions import AllowAny, IsAuthenticated
-
-from projects.permissions import IsProjectContributor, IsProjectAuthorOrReadOnlyContributor, IsCommentAuthor
+from rest_framework.generics import (
+    CreateAPIView, GenericAPIView, ListCreateAPIView, RetrieveUpdateDestroyAPIView, DestroyAPIView
+)
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.permissions import AllowAny, SAFE_METHODS
+from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework.utils.urls import replace_query_param
+
+from projects.permissions import (
+    IsAuthenticated, IsProjectContributor, IsProjectAuthorOrReadOnlyContributor, IsCommentAuthor
+)
+from projects.membership import get_project_membership, membership_cache
 from projects.models import Project, Contributor, Issue, Comment
+from projects.search import fts_query, issue_search_filter, search_project
+from projects.stats import get_project_stats, stats_cache
+from helpers.cache import invalidate_on_commit
+from helpers.sqlite import retry_on_lock
+from .conditional import ConditionalListMixin, ConditionalRetrieveMixin
+from .export import EXPORT_RECORDS, export_sections, ndjson_lines, csv_lines
+from .fastpath import FastListMixin, PROJECT_LIST_PLAN, CONTRIBUTOR_PLAN, ISSUE_PLAN
+from .renderers import NDJSONRenderer, CSVRenderer
 from .serializers import (
     SignupSerializer,
     ProjectListSerializer,
     ProjectDetailSerializer,
     ContributorSerializer,
+    ContributorBatchSerializer,
     IssueSerializer,
-    CommentSerializer
+    CommentSerializer,
+    get_request_shape,
+    related_lookups
     )
 
 CustomUser = get_user_model()
 
 
-class SignupAPIView(CreateAPIView):
+def issue_queryset():
+    """Problèmes avec les jointures et préchargements du IssueSerializer (nombre de requêtes constant)."""
+    return (
+        Issue.objects
+        .select_related('author_user_id', 'assigned_user_id', 'project_id')
+        .prefetch_related('project_id__contributors')
+    )
+
+
+def comment_queryset():
+    """Commentaires avec les jointures et préchargements du CommentSerializer (nombre de requêtes constant)."""
+    return (
+        Comment.objects
+        .select_related('author_user_id', 'issue_id__project_id', 'issue_id__assigned_user_id')
+        .prefetch_related('issue_id__project_id__contributors')
+    )
+
+
+class LockRetryMixin:
+    """
+    Écritures (méthodes hors SAFE_METHODS) traitées dans une transaction, rejouée avec attente exponentielle
+    lorsque la base SQLite est verrouillée (helpers.sqlite.retry_on_lock, settings DATABASE_LOCK_RETRY).
+    Dans une transaction déjà ouverte, la requête est traitée sans nouvel essai.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in SAFE_METHODS or transaction.get_connection().in_atomic_block:
+            return super().dispatch(request, *args, **kwargs)
+        # Corps lu une fois et conservé : chaque essai le relit.
+        request.body
+        return retry_on_lock(self.atomic_dispatch)(request, *args, **kwargs)
+
+    def atomic_dispatch(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class ShapedQuerysetMixin:
+    """
+    Limite les jointures et préchargements du queryset à la forme demandée par ?fields= et ?expand=
+    (objets imbriqués réduits à leur clé primaire : aucune jointure). Sans ces paramètres, le queryset est inchangé.
+    shape_select_related : jointures toujours nécessaires à la vue (dates de l'ETag par exemple).
+    """
+
+    shape_select_related = ()
+
+    def shape_queryset(self, queryset):
+        if get_request_shape(self.request) is None:
+            return queryset
+        select, prefetch = related_lookups(self.get_serializer(), queryset.model)
+        select += self.shape_select_related
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if select:
+            queryset = queryset.select_related(*select)
+        return queryset.prefetch_related(*prefetch)
+
+
+class ProjectMembershipMixin:
+    """Réutilise l'appartenance au projet déjà résolue par les classes de permission."""
+
+    @property
+    def membership(self):
+        return get_project_membership(self.request, self.kwargs['project_id'])
+
+    def get_contributor_user(self, user_id):
+        """Retourne l'utilisateur s'il contribue au projet (None sinon), en une seule requête."""
+        if str(user_id) == str(self.request.user.pk) and self.membership.is_contributor():
+            return self.request.user
+        contributor = (
+            Contributor.objects
+            .select_related('user_id')
+            .filter(user_id=user_id, project_id=self.kwargs['project_id'])
+            .first()
+        )
+        return contributor.user_id if contributor else None
+
+
+class SignupAPIView(LockRetryMixin, CreateAPIView):
     """Créer un compte CustomUser."""
 
     permission_classes = [AllowAny]
@@ -35,7 +134,11 @@ class SignupAPIView(CreateAPIView):
         return self.create(request, *args, **kwargs)
 
 
-class ProjectListAPIView(ListCreateAPIView):
+class LoginAPIView(LockRetryMixin, TokenObtainPairView):
+    """Obtenir une paire de jetons JWT (TokenObtainPairView de simplejwt)."""
+
+
+class ProjectListAPIView(LockRetryMixin, FastListMixin, ListCreateAPIView):
     """
     Afficher la liste des projets auxquels l'utilisateur connecté contribue
     (permission: settings IsAuthenticated + queryset).
@@ -44,6 +147,7 @@ class ProjectListAPIView(ListCreateAPIView):
     """
 
     serializer_class = ProjectListSerializer
+    fast_plan = PROJECT_LIST_PLAN
 
     def get_queryset(self):
         user = self.request.user
@@ -64,53 +168,58 @@ class ProjectListAPIView(ListCreateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST, *args, **kwargs)
 
 
-class ProjectDetailAPIView(RetrieveUpdateDestroyAPIView):
+class ProjectDetailAPIView(
+    LockRetryMixin, ConditionalRetrieveMixin, ProjectMembershipMixin, RetrieveUpdateDestroyAPIView
+):
     """
     Afficher le détail du projet auquel l'utilisateur connecté contribue (filtrage: project_id).
     Mettre à jour le projet (permission: auteur connecté).
     Supprimer le projet (permission: auteur connecté).
+    Consultation conditionnelle : réponse 304 si l'ETag ou la date de modification du client sont à jour.
     """
 
     serializer_class = ProjectDetailSerializer
     permission_classes = [IsAuthenticated, IsProjectContributor, IsProjectAuthorOrReadOnlyContributor]
 
     def get_object(self):
-        project_id = self.kwargs['project_id']
-        obj = get_object_or_404(Project, project_id=project_id)
+        obj = self.membership.project
         self.check_object_permissions(self.request, obj)
         return obj
 
-    def put(self, request, *args, **kwargs):
-        project = self.get_object()
-        project.updated_at = datetime.datetime.now()
-        project.save()
-        return self.update(request, *args, **kwargs)
 
-
-class ContributorsAPIView(ListCreateAPIView):
+class ContributorsAPIView(
+    LockRetryMixin, ConditionalListMixin, ShapedQuerysetMixin, ProjectMembershipMixin, FastListMixin, ListCreateAPIView
+):
     """
     Afficher la liste des collaborateurs au projet (filtrage par project_id).
+    Liste conditionnelle : réponse 304 si l'ETag du client correspond à la version de la liste.
     Ajouter un collaborateur-assigné si l'utilisateur existe
     et n'est pas déjà rattaché au projet (permission : auteur connecté).
     """
 
     serializer_class = ContributorSerializer
     permission_classes = [IsAuthenticated, IsProjectContributor, IsProjectAuthorOrReadOnlyContributor]
+    fast_plan = CONTRIBUTOR_PLAN
+
+    def get_queryset(self):
+        return self.shape_queryset(
+            Contributor.objects.filter(project_id=self.kwargs['project_id']).select_related('user_id')
+        )
+
+    def get_list_version_queryset(self):
+        return Project.objects.filter(project_id=self.kwargs['project_id']).values_list('version', flat=True)
 
     def list(self, request, *args, **kwargs):
-        project_id = kwargs['project_id']
-        queryset = Contributor.objects.filter(project_id=project_id)
+        queryset = self.list_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
 
-        if not queryset:
+        if not page and not queryset.exists():
             return Response(status=status.HTTP_403_FORBIDDEN)
 
-        page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+            return self.get_paginated_response(self.list_data(page))
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return Response(self.list_data(queryset))
 
     def post(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data)
@@ -133,12 +242,11 @@ class ContributorsAPIView(ListCreateAPIView):
                     status=status.HTTP_409_CONFLICT
                 )
 
-            project = Project.objects.get(project_id=project_id)
             contributor = Contributor.objects.create(
                 permission='ASSIGNED',
                 role=request.data['role'],
                 user_id=custom_user,
-                project_id=project
+                project_id=self.membership.project
             )
             json_contributor = ContributorSerializer(contributor)
             json = {
@@ -150,7 +258,7 @@ class ContributorsAPIView(ListCreateAPIView):
         return Response(status=status.HTTP_400_BAD_REQUEST, *args, **kwargs)
 
 
-class ContributorDeleteAPIView(DestroyAPIView):
+class ContributorDeleteAPIView(LockRetryMixin, DestroyAPIView):
     """Supprimer un collaborateur (hors auteur, permission: auteur connecté)."""
 
     permission_classes = [IsAuthenticated, IsProjectContributor, IsProjectAuthorOrReadOnlyContributor]
@@ -175,30 +283,178 @@ class ContributorDeleteAPIView(DestroyAPIView):
             return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class IssuesAPIView(ListCreateAPIView):
+class ContributorsBatchAPIView(LockRetryMixin, ProjectMembershipMixin, GenericAPIView):
+    """
+    Ajouter et retirer des collaborateurs par lot, utilisateurs désignés par user_id ou email
+    (permission : auteur connecté). Le lot est traité dans une seule transaction
+    et le résultat est rapporté par élément (statut et message).
     """
-    Afficher la liste des problèmes du projet (filtrage par project_id).
+
+    serializer_class = ContributorBatchSerializer
+    permission_classes = [IsAuthenticated, IsProjectContributor, IsProjectAuthorOrReadOnlyContributor]
+    max_batch_size = 1000
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), 'max_size': self.max_batch_size}
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        to_add = serializer.validated_data['add']
+        to_remove = serializer.validated_data['remove']
+        users = self.resolve_users([item['user'] for item in to_add] + to_remove)
+
+        with transaction.atomic():
+            results = self.add_contributors(to_add, users) + self.remove_contributors(to_remove, users)
+            added = sum(1 for result in results if result['status'] == status.HTTP_201_CREATED)
+            removed = sum(1 for result in results if result['status'] == status.HTTP_204_NO_CONTENT)
+            if added or removed:
+                Project.bump_version(
+                    self.kwargs['project_id'], touch=True, counters={'contributor_count': added - removed}
+                )
+        return Response(results, status=status.HTTP_200_OK)
+
+    def resolve_users(self, identifiers):
+        """Retourne les utilisateurs désignés par user_id ou email, indexés par identifiant, en une seule requête."""
+        keys, user_ids, emails = {}, set(), set()
+        for identifier in identifiers:
+            try:
+                keys[identifier] = str(uuid.UUID(identifier))
+                user_ids.add(keys[identifier])
+            except ValueError:
+                keys[identifier] = identifier
+                emails.add(identifier)
+
+        resolved = {}
+        for user in CustomUser.objects.filter(Q(user_id__in=user_ids) | Q(email__in=emails)):
+            resolved[str(user.user_id)] = resolved[user.email] = user
+        return {identifier: resolved.get(key) for identifier, key in keys.items()}
+
+    def add_contributors(self, items, users):
+        """
+        Insère les contributeurs en une requête ; les doublons sont écartés par la contrainte
+        unique_together (ignore_conflicts) puis identifiés en relisant les clés insérées.
+        """
+        project = self.membership.project
+        results, contributors, seen = [], [], set()
+        for item in items:
+            user = users[item['user']]
+            result = {'action': 'add', 'user': item['user']}
+            if user is None:
+                result.update(status=status.HTTP_404_NOT_FOUND, message="Utilisateur introuvable.")
+            elif user.pk in seen:
+                result.update(
+                    status=status.HTTP_409_CONFLICT, message="Utilisateur présent plusieurs fois dans le lot."
+                )
+            else:
+                seen.add(user.pk)
+                contributor = Contributor(
+                    contributor_id=uuid.uuid4(), permission='ASSIGNED', role=item['role'],
+                    user_id=user, project_id=project
+                )
+                contributors.append(contributor)
+                result['contributor'] = contributor
+            results.append(result)
+
+        Contributor.objects.bulk_create(contributors, ignore_conflicts=True)
+        inserted = set(
+            Contributor.objects.filter(pk__in=[contributor.pk for contributor in contributors])
+            .values_list('pk', flat=True)
+        )
+
+        for result in results:
+            contributor = result.pop('contributor', None)
+            if contributor is None:
+                continue
+            if contributor.pk in inserted:
+                invalidate_on_commit(membership_cache.invalidate, contributor.user_id_id, project.pk)
+                result.update(status=status.HTTP_201_CREATED, contributor=ContributorSerializer(contributor).data)
+            else:
+                result.update(
+                    status=status.HTTP_409_CONFLICT, message="L'utilisateur fait déjà partie des contributeurs."
+                )
+        return results
+
+    def remove_contributors(self, identifiers, users):
+        """Supprime les contributeurs désignés en une requête, l'auteur du projet excepté."""
+        project_id = self.kwargs['project_id']
+        members = {
+            contributor.user_id_id: contributor
+            for contributor in Contributor.objects.filter(
+                project_id=project_id, user_id__in=[user.pk for user in users.values() if user is not None]
+            )
+        }
+
+        results, removed = [], set()
+        for identifier in identifiers:
+            user = users[identifier]
+            contributor = members.get(user.pk) if user is not None else None
+            result = {'action': 'remove', 'user': identifier}
+            if user is None:
+                result.update(status=status.HTTP_404_NOT_FOUND, message="Utilisateur introuvable.")
+            elif contributor is None or contributor.pk in removed:
+                result.update(
+                    status=status.HTTP_404_NOT_FOUND, message="L'utilisateur ne fait pas partie des contributeurs."
+                )
+            elif contributor.is_author():
+                result.update(
+                    status=status.HTTP_403_FORBIDDEN, message="L'auteur du projet ne peut pas être supprimé."
+                )
+            else:
+                removed.add(contributor.pk)
+                result['status'] = status.HTTP_204_NO_CONTENT
+            results.append(result)
+
+        if removed:
+            Contributor.objects.filter(pk__in=removed).delete()
+        return results
+
+
+class IssuesAPIView(
+    LockRetryMixin, ConditionalListMixin, ShapedQuerysetMixin, ProjectMembershipMixin, FastListMixin, ListCreateAPIView
+):
+    """
+    Afficher la liste des problèmes du projet (filtrage par project_id,
+    recherche plein texte sur le titre et la description avec ?q=,
+    tri par date de création ou par dernière activité avec ?ordering=-last_activity_at).
+    Liste conditionnelle : réponse 304 si l'ETag du client correspond à la version de la liste.
     Créer un problème lié au projet si l'assigned_user_id est un contributeur
     (utilise la donnée assigned_user_id de contexte pour la création du problème
     ou celle du champ de saisie s'il existe, permission: contributeur connecté)
+    Créer un lot de problèmes à partir d'une liste JSON, en une seule transaction
+    (aucun problème n'est créé si un élément est invalide, erreurs rapportées par élément).
     """
 
     serializer_class = IssueSerializer
     permission_classes = [IsAuthenticated, IsProjectContributor]
+    fast_plan = ISSUE_PLAN
+    max_bulk_size = 1000
+    ordering_param = 'ordering'
+    # Tris proposés -> champ de date du curseur (KeysetPagination), chacun servi par un index de Issue.Meta.
+    orderings = {
+        '-created_at': 'created_at',
+        '-last_activity_at': 'last_activity_at',
+    }
+
+    @property
+    def keyset_field(self):
+        return self.orderings.get(self.request.query_params.get(self.ordering_param), 'created_at')
 
-    def list(self, request, *args, **kwargs):
-        project_id = kwargs['project_id']
-        queryset = Issue.objects.filter(project_id=project_id)
-
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+    def get_queryset(self):
+        queryset = issue_queryset().filter(project_id=self.kwargs['project_id'])
+        if (query := fts_query(self.request.query_params.get('q'))):
+            queryset = queryset.filter(issue_id__in=issue_search_filter(query))
+        if (field := self.keyset_field) != 'created_at':
+            queryset = queryset.order_by(f'-{field}', '-issue_id')
+        return self.shape_queryset(queryset)
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+    def get_list_version_queryset(self):
+        return Project.objects.filter(project_id=self.kwargs['project_id']).values_list('version', flat=True)
 
     def create(self, request, *args, **kwargs):
+        if isinstance(request.data, list):
+            return self.create_many(request)
+
         serializer = self.serializer_class(context={'request': request}, data=request.data)
         serializer.is_valid(raise_exception=True)
 
@@ -212,36 +468,95 @@ class IssuesAPIView(ListCreateAPIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
     def perform_create(self, serializer):
-        project_id = self.kwargs['project_id']
-        project = Project.objects.get(project_id=project_id)
+        project = self.membership.project
 
         if (assigned_user_id := self.request.data.get("assigned_user_id")):
-            assigned_user = CustomUser.objects.get(user_id=assigned_user_id)
+            assigned_user = self.get_contributor_user(assigned_user_id)
 
-            if Contributor.objects.filter(user_id=assigned_user_id, project_id=project_id).exists():
+            if assigned_user is not None:
                 serializer.save(project_id=project, assigned_user_id=assigned_user)
                 return Response(status=status.HTTP_201_CREATED)
             else:
                 return False
         serializer.save(project_id=project)
 
+    def create_many(self, request):
+        """
+        Valide le lot, vérifie les utilisateurs assignés en une seule requête IN
+        puis insère tous les problèmes par bulk_create dans une transaction.
+        """
+        serializer = self.get_serializer(data=request.data, many=True, max_length=self.max_bulk_size)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        requested_ids = {
+            item['assigned_user_id'] for item in serializer.validated_data
+            if not isinstance(item['assigned_user_id'], CustomUser)
+        }
+        assignees = {
+            contributor.user_id.pk: contributor.user_id
+            for contributor in Contributor.objects.select_related('user_id').filter(
+                project_id=self.kwargs['project_id'], user_id__in=requested_ids
+            )
+        }
+
+        errors = [{} for _ in serializer.validated_data]
+        issues = []
+        project = self.membership.project
+        for index, item in enumerate(serializer.validated_data):
+            assigned_user = item.pop('assigned_user_id')
+            if not isinstance(assigned_user, CustomUser):
+                assigned_user = assignees.get(assigned_user)
+            if assigned_user is None:
+                errors[index] = {'assigned_user_id': ["L'utilisateur assigné ne fait pas partie des contributeurs"]}
+                continue
+            item.pop('author_user_id', None)
+            issues.append(Issue(
+                **item, project_id=project, author_user_id=request.user, assigned_user_id=assigned_user
+            ))
+
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            Issue.objects.bulk_create(issues)
+            Project.bump_version(
+                project.pk, counters=Project.issue_counter_changes(added=[issue.status for issue in issues])
+            )
+        invalidate_on_commit(stats_cache.invalidate, project.pk)
+
+        prefetch_related_objects([project], 'contributors')
+        data = self.get_serializer(issues, many=True).data
+        return Response(data, status=status.HTTP_201_CREATED)
 
-class IssueAPIView(RetrieveUpdateDestroyAPIView):
+
+class IssueAPIView(
+    LockRetryMixin, ConditionalRetrieveMixin, ShapedQuerysetMixin, ProjectMembershipMixin,
+    RetrieveUpdateDestroyAPIView
+):
     """
     Mettre à jour ou supprimer le problème récupéré par le get_object
     (author du problème + permission: contributeur connecté).
+    Consultation conditionnelle : réponse 304 si l'ETag ou la date de modification du client sont à jour.
     """
 
     serializer_class = IssueSerializer
     permission_classes = [IsAuthenticated, IsProjectContributor]
+    shape_select_related = ['project_id']
 
     def get_object(self):
         project_id = self.kwargs['project_id']
         issue_id = self.kwargs['issue_id']
-        obj = get_object_or_404(Issue, author_user_id=self.request.user, project_id=project_id, issue_id=issue_id)
+        obj = get_object_or_404(
+            self.shape_queryset(issue_queryset()),
+            author_user_id=self.request.user, project_id=project_id, issue_id=issue_id
+        )
         self.check_object_permissions(self.request, obj)
         return obj
 
+    def get_validator_dates(self, instance):
+        return [instance.updated_at, instance.last_activity_at, instance.project_id.updated_at]
+
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data)
@@ -255,39 +570,63 @@ class IssueAPIView(RetrieveUpdateDestroyAPIView):
         return Response(serializer.data)
 
     def perform_update(self, serializer):
-        project_id = self.kwargs['project_id']
         assigned_user_id = self.request.data.get("assigned_user_id", None)
 
         if assigned_user_id:
-            try:
-                assigned_user = CustomUser.objects.get(user_id=assigned_user_id)
-                if Contributor.objects.filter(user_id=assigned_user_id, project_id=project_id).exists():
-                    serializer.save(assigned_user_id=assigned_user, updated_at=datetime.datetime.now())
-                else:
-                    return False
-            except CustomUser.DoesNotExist:
+            assigned_user = self.get_contributor_user(assigned_user_id)
+            if assigned_user is not None:
+                serializer.save(assigned_user_id=assigned_user)
+            else:
                 return False
         else:
-            serializer.save(updated_at=datetime.datetime.now())
+            serializer.save()
+
+    def perform_destroy(self, instance):
+        """
+        Supprime le problème (et ses commentaires en cascade), puis versionne le projet, décompte le problème
+        de ses compteurs et invalide ses statistiques : Issue et Comment n'ont pas de receveur post_delete,
+        pour que la suppression d'un projet reste une suppression rapide.
+        """
+        project_id = instance.project_id_id
+        loaded_status = getattr(instance, '_loaded_status', None)
+        instance.delete()
+        if loaded_status is None:
+            Project.bump_version(project_id)
+            Project.reconcile_counters(project_id)
+        else:
+            Project.bump_version(project_id, counters=Project.issue_counter_changes(removed=[loaded_status]))
+        invalidate_on_commit(stats_cache.invalidate, project_id)
 
 
-class CommentsAPIView(ListCreateAPIView):
+class CommentsAPIView(
+    LockRetryMixin, ConditionalListMixin, ShapedQuerysetMixin, ProjectMembershipMixin, ListCreateAPIView
+):
     """
     Afficher la liste des commentaires du problème.
+    Liste conditionnelle : réponse 304 si l'ETag du client correspond à la version de la liste.
     Créer un commentaire sur un problème du projet (permission: contributeur connecté)
     """
 
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated, IsProjectContributor]
 
+    def get_queryset(self):
+        return self.shape_queryset(comment_queryset().filter(issue_id=self.kwargs['issue_id']))
+
+    def get_list_version_queryset(self):
+        """Version des commentaires, date du problème (utilisateur assigné) et version du projet (contributeurs)."""
+        return (
+            Issue.objects.filter(issue_id=self.kwargs['issue_id'])
+            .values_list('comments_version', 'updated_at', 'project_id__version')
+        )
+
     def list(self, request, *args, **kwargs):
-        issue_id = self.kwargs['issue_id']
-        queryset = Comment.objects.filter(issue_id=issue_id)
+        queryset = self.get_queryset()
+        page = self.paginate_queryset(queryset)
 
-        if not queryset:
+        if not page and not queryset.exists():
             return Response(status=status.HTTP_404_NOT_FOUND)
 
-        page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
@@ -297,25 +636,125 @@ class CommentsAPIView(ListCreateAPIView):
 
     def perform_create(self, serializer):
         issue_id = self.kwargs['issue_id']
-        issue = Issue.objects.get(issue_id=issue_id)
+        issue = get_object_or_404(Issue, issue_id=issue_id, project_id=self.membership.project_id)
         serializer.save(author_user_id=self.request.user, issue_id=issue)
 
 
-class CommentAPIView(RetrieveUpdateDestroyAPIView):
+class CommentAPIView(
+    LockRetryMixin, ConditionalRetrieveMixin, ShapedQuerysetMixin, RetrieveUpdateDestroyAPIView
+):
     """
     Consulter, mettre à jour ou supprimer le commentaire du problème
     récupéré par le get_object (comment_id + permission: contributeur connecté
     et auteur du commentaire).
+    Consultation conditionnelle : réponse 304 si l'ETag ou la date de modification du client sont à jour.
     """
 
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated, IsProjectContributor, IsCommentAuthor]
+    shape_select_related = ['issue_id__project_id']
 
     def get_object(self):
         comment_id = self.kwargs['comment_id']
-        obj = get_object_or_404(Comment, comment_id=comment_id)
+        obj = get_object_or_404(self.shape_queryset(comment_queryset()), comment_id=comment_id)
         self.check_object_permissions(self.request, obj)
         return obj
 
-    def perform_update(self, serializer):
-        serializer.save(updated_at=datetime.datetime.now())
+    def get_validator_dates(self, instance):
+        return [instance.updated_at, instance.issue_id.updated_at, instance.issue_id.project_id.updated_at]
+
+    def perform_destroy(self, instance):
+        """
+        Supprime le commentaire, puis le décompte du problème, date sa dernière activité
+        et invalide les statistiques du projet (voir IssueAPIView.perform_destroy).
+        """
+        issue = instance.issue_id
+        instance.delete()
+        Issue.bump_comments_version(issue.pk, comment_count=-1)
+        invalidate_on_commit(stats_cache.invalidate, issue.project_id_id)
+
+
+class SearchAPIView(GenericAPIView):
+    """
+    Rechercher dans les problèmes (titre, description) et les commentaires du projet (?q=),
+    résultats classés par pertinence avec extraits surlignés (permission: contributeur connecté).
+    """
+
+    permission_classes = [IsAuthenticated, IsProjectContributor]
+    max_limit = 100
+
+    def get(self, request, *args, **kwargs):
+        query = fts_query(request.query_params.get('q'))
+        if query is None:
+            return Response(
+                {'message': "Le paramètre de recherche q est obligatoire."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        paginator = LimitOffsetPagination()
+        paginator.max_limit = self.max_limit
+        limit = paginator.get_limit(request)
+        offset = paginator.get_offset(request)
+        results = search_project(self.kwargs['project_id'], query, limit + 1, offset)
+
+        url = request.build_absolute_uri()
+        next_url = None
+        if len(results) > limit:
+            next_url = replace_query_param(url, paginator.offset_query_param, offset + limit)
+        previous_url = None
+        if offset > 0:
+            previous_url = replace_query_param(url, paginator.offset_query_param, max(offset - limit, 0))
+        return Response({'next': next_url, 'previous': previous_url, 'results': results[:limit]})
+
+
+class ProjectStatsAPIView(GenericAPIView):
+    """
+    Statistiques du projet (permission: contributeur connecté) : nombre de problèmes et de commentaires,
+    au total et par statut, priorité, balise et utilisateur assigné, calculés par une seule requête groupée
+    et mis en cache jusqu'à la prochaine écriture d'un problème ou d'un commentaire du projet.
+    """
+
+    permission_classes = [IsAuthenticated, IsProjectContributor]
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_project_stats(kwargs['project_id']))
+
+
+class ProjectExportAPIView(GenericAPIView):
+    """
+    Exporter le projet, ses contributeurs, ses problèmes et leurs commentaires (permission: contributeur connecté),
+    au format NDJSON (par défaut, un enregistrement par ligne) ou CSV (?format=csv, un seul type d'enregistrement,
+    problèmes par défaut). Types choisis par ?records=project,contributor,issue,comment.
+    Réponse diffusée au fil de la lecture, par lots de export_chunk_size lignes, avec les règles de rendu
+    de IssueSerializer et CommentSerializer (objets imbriqués réduits à leur clé primaire).
+    """
+
+    permission_classes = [IsAuthenticated, IsProjectContributor]
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+    export_chunk_size = 1000
+
+    def get(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        default = EXPORT_RECORDS if renderer.format == 'ndjson' else ('issue',)
+        records = [record for record in request.query_params.get('records', '').split(',') if record] or default
+        if set(records) - set(EXPORT_RECORDS):
+            return Response(
+                {'message': f"Types d'enregistrements disponibles : {', '.join(EXPORT_RECORDS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if renderer.format == 'csv' and len(records) > 1:
+            return Response(
+                {'message': "L'export CSV ne contient qu'un type d'enregistrement."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        project_id = kwargs['project_id']
+        # Alias choisi pendant la requête (réplique pour les lectures) : la réponse est lue après le middleware.
+        sections = export_sections(project_id, records, using=router.db_for_read(Issue))
+        if renderer.format == 'csv':
+            lines = csv_lines(sections[0], self.export_chunk_size)
+        else:
+            lines = ndjson_lines(sections, self.export_chunk_size)
+        response = StreamingHttpResponse(lines, content_type=f'{renderer.media_type}; charset={renderer.charset}')
+        response['Content-Disposition'] = f'attachment; filename="project-{project_id}.{renderer.format}"'
+        return response
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Lectures servies par les vues asynchrones de apis.async_views (voir settings ASYNC_READ_VIEWS).
+os.environ.setdefault('ASYNC_READ_VIEWS', '1')
 
 application = get_asgi_application()
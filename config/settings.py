@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -48,6 +49,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'helpers.middleware.RequestMetricsMiddleware',
+    'helpers.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
@@ -87,9 +90,51 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Profil de PRAGMA appliqué à chaque connexion par helpers.sqlite : 'wal', 'default', 'readonly'
+        # ou dictionnaire {pragma: valeur}.
+        'PRAGMAS': os.environ.get('SQLITE_PRAGMAS', 'wal'),
+        # Connexions persistantes (secondes), vérifiées avant d'être réutilisées par une nouvelle requête.
+        'CONN_MAX_AGE': int(os.environ.get('CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Écritures des vues de apis (LockRetryMixin) rejouées lorsque la base est verrouillée : au plus ATTEMPTS essais,
+# attente exponentielle de BASE_DELAY à MAX_DELAY secondes entre deux essais.
+DATABASE_LOCK_RETRY = {
+    'ATTEMPTS': 5,
+    'BASE_DELAY': 0.05,
+    'MAX_DELAY': 1.0,
+}
+
+# Réplique en lecture (helpers.routing) : lectures des requêtes GET, HEAD et OPTIONS servies par l'alias 'replica',
+# sauf pendant STICKY_SECONDS après une écriture du même utilisateur (il lit ses propres écritures).
+# MODE 'uri' : connexion SQLite en lecture seule (mode=ro) sur le fichier de 'default' ;
+# MODE 'backup' : copie NAME synchronisée par l'API de sauvegarde SQLite (commande sync_replica, ou dans
+# le processus toutes les SYNC_INTERVAL secondes, à garder inférieur à STICKY_SECONDS).
+# BACKEND : alias optionnel de CACHES partageant les écritures récentes entre processus.
+DATABASE_REPLICA = {
+    'ENABLED': os.environ.get('DATABASE_REPLICA', '1') == '1',
+    'MODE': os.environ.get('DATABASE_REPLICA_MODE', 'uri'),
+    'NAME': BASE_DIR / 'db.replica.sqlite3',
+    'SYNC_INTERVAL': 1.0,
+    'STICKY_SECONDS': 5,
+    'MAX_ENTRIES': 10000,
+    'BACKEND': None,
+}
+
+if DATABASE_REPLICA['ENABLED']:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': 'file:{}?mode=ro'.format(
+            DATABASES['default']['NAME'] if DATABASE_REPLICA['MODE'] == 'uri' else DATABASE_REPLICA['NAME']
+        ),
+        'PRAGMAS': 'readonly',
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['helpers.routing.ReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -109,6 +154,28 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Hachage des mots de passe : pbkdf2_sha256 par accounts.hashers.ProfilePBKDF2PasswordHasher,
+# les autres algorithmes de Django restent reconnus pour les mots de passe existants.
+PASSWORD_HASHERS = [
+    'accounts.hashers.ProfilePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# PROFILE : 'standard' (itérations recommandées par Django), 'strong' ou 'fast' (tests uniquement) ;
+# ITERATIONS : valeur explicite prioritaire. Un mot de passe haché avec d'autres paramètres est rehaché à la connexion.
+# Inscription et connexion servies en ASGI (apis.async_views) : hachages attendus dans un pool borné,
+# EXECUTOR 'thread' ou 'process', MAX_WORKERS (par défaut nombre de CPU).
+# En WSGI, hachage dans le thread de la requête.
+PASSWORD_HASHING = {
+    'PROFILE': 'standard',
+    'ITERATIONS': None,
+    'EXECUTOR': 'thread',
+    'MAX_WORKERS': None,
+}
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -145,16 +212,96 @@ CORS_ALLOWED_ORIGINS = (
 CSRF_TRUSTED_ORIGINS = ["http://localhost:8000"]
 
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    # Pagination par décalage, ou par curseur avec ?pagination=cursor (voir apis.pagination)
+    'DEFAULT_PAGINATION_CLASS': 'apis.pagination.SelectablePagination',
     'PAGE_SIZE': 10,
     'DEFAULT_PERMISSION_CLASSES': [
-        'rest_framework.permissions.IsAuthenticated',
+        'projects.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.TokenUserAuthentication',
     )
 }
 
+# Lectures (projets, contributeurs, problèmes, commentaires) servies par les vues asynchrones de apis.async_views :
+# activé par config/asgi.py (variable d'environnement ASYNC_READ_VIEWS), les écritures restent synchrones.
+ASYNC_READ_VIEWS = os.environ.get('ASYNC_READ_VIEWS', '0') == '1'
+
+# Rendu des listes de projets, contributeurs et problèmes par les plans de apis.fastpath
+# (lectures values_list, sortie identique aux serializers) ; False pour revenir aux serializers.
+FAST_LIST_SERIALIZERS = True
+
+# Utilisateurs authentifiés par jeton JWT (accounts.authentication.TokenUserAuthentication) sans lecture en base
+# à chaque requête : cache LRU du processus, invalidé à l'enregistrement d'un CustomUser. TIMEOUT borne la durée
+# pendant laquelle une modification faite par un autre processus (ou par QuerySet.update) peut être ignorée.
+TOKEN_USER_CACHE = {
+    'MAX_ENTRIES': 10000,
+    'TIMEOUT': 300,
+}
+
+# Compaction des jetons JWT expirés (token_blacklist) : commande compact_tokens, ou balayage périodique dans
+# le processus toutes les SWEEP_INTERVAL secondes (None : désactivé), par lots de BATCH_SIZE jetons
+# (au plus MAX_BATCHES lots par balayage, None : sans limite).
+TOKEN_COMPACTION = {
+    'SWEEP_INTERVAL': None,
+    'BATCH_SIZE': 1000,
+    'MAX_BATCHES': None,
+}
+
+# Cache des permissions des contributeurs (user_id, project_id) partagé entre les requêtes.
+# BACKEND : alias optionnel de CACHES (ex. cache partagé entre processus), sinon cache LRU du processus.
+MEMBERSHIP_CACHE = {
+    'MAX_ENTRIES': 10000,
+    'TIMEOUT': 300,
+    'BACKEND': None,
+}
+
+# Cache des statistiques par projet (projects.stats), invalidé à l'écriture d'un problème ou d'un commentaire.
+# BACKEND : alias optionnel de CACHES (ex. cache partagé entre processus), sinon cache LRU du processus.
+PROJECT_STATS_CACHE = {
+    'MAX_ENTRIES': 1000,
+    'TIMEOUT': 300,
+    'BACKEND': None,
+}
+
+# Instrumentation optionnelle des requêtes (helpers.middleware.RequestMetricsMiddleware) :
+# en-tête Server-Timing, journalisation structurée (logger 'request_metrics')
+# et budgets de requêtes SQL par nom de route, ex. {'comments': 6}.
+# BUDGET_ACTION : 'warn' (journalise un avertissement) ou 'raise' (lève QueryBudgetExceeded).
+REQUEST_METRICS = {
+    'ENABLED': False,
+    'SERVER_TIMING': True,
+    'QUERY_BUDGETS': {},
+    'BUDGET_ACTION': 'warn',
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'request_metrics': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'token_compaction': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'database_replica': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=20),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
@@ -1,7 +1,8 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('', include('apis.urls')),
+    path('', include('apis.async_urls' if settings.ASYNC_READ_VIEWS else 'apis.urls')),
 ]
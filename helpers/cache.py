@@ -0,0 +1,62 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.db import transaction
+
+
+class LRUCache:
+    """Cache mémoire du processus, borné en nombre d'entrées (LRU) et en durée de vie (TTL)."""
+
+    def __init__(self, max_entries=1024, timeout=300):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                expires_at, value = self._data[key]
+            except KeyError:
+                return default
+            if self.timeout is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.timeout if self.timeout is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_matching(self, predicate):
+        """Supprime les entrées dont la clé vérifie le prédicat."""
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def invalidate_on_commit(invalidate, *args, using=None):
+    """
+    Invalide tout de suite (la suite de la transaction relit la base) puis de nouveau après sa validation :
+    une requête concurrente qui a lu l'ancienne valeur avant la validation a pu la remettre en cache entre-temps.
+    Hors transaction, la seconde invalidation est exécutée immédiatement.
+    """
+    invalidate(*args)
+    transaction.on_commit(lambda: invalidate(*args), using=using)
@@ -0,0 +1,68 @@
+import contextvars
+import time
+from contextlib import contextmanager
+
+_current_metrics = contextvars.ContextVar('request_metrics', default=None)
+
+
+class QueryTimer:
+    """Wrapper d'exécution SQL (connection.execute_wrapper) comptant les requêtes et leur durée cumulée."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+class RequestMetrics:
+    """Mesures d'une requête : requêtes SQL et durées cumulées par étape (vue, sérialisation...)."""
+
+    def __init__(self):
+        self.queries = QueryTimer()
+        self.durations = {}
+        self._active = set()
+
+    @contextmanager
+    def timer(self, name):
+        """Cumule la durée de l'étape ; les appels imbriqués d'une même étape ne sont comptés qu'une fois."""
+        if name in self._active:
+            yield
+            return
+        self._active.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._active.discard(name)
+            self.durations[name] = self.durations.get(name, 0.0) + time.perf_counter() - start
+
+
+def current_metrics():
+    return _current_metrics.get()
+
+
+def activate_metrics(metrics):
+    """Rattache les mesures au contexte courant ; retourne le jeton à passer à deactivate_metrics."""
+    return _current_metrics.set(metrics)
+
+
+def deactivate_metrics(token):
+    _current_metrics.reset(token)
+
+
+@contextmanager
+def timed(name):
+    """Mesure une étape de la requête en cours, sans effet si l'instrumentation est inactive."""
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    with metrics.timer(name):
+        yield
@@ -0,0 +1,134 @@
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from rest_framework.permissions import SAFE_METHODS
+
+from accounts.authentication import get_token_user_id
+from helpers.metrics import RequestMetrics, activate_metrics, deactivate_metrics
+from helpers.routing import replica_enabled, sticky_writes, use_replica
+
+logger = logging.getLogger('request_metrics')
+
+
+class QueryBudgetExceeded(Exception):
+    """Levée lorsque le nombre de requêtes SQL d'une route dépasse son budget (BUDGET_ACTION 'raise')."""
+
+
+class RequestMetricsMiddleware:
+    """
+    Instrumentation optionnelle des requêtes (REQUEST_METRICS['ENABLED']) : nombre et durée des requêtes SQL,
+    durées de la vue et de la sérialisation, publiées dans l'en-tête Server-Timing et journalisées
+    (logger 'request_metrics'). Les budgets de requêtes SQL sont définis par nom de route.
+    Ne dépend pas de DEBUG : les requêtes sont comptées sans être conservées en mémoire.
+    """
+
+    def __init__(self, get_response):
+        options = getattr(settings, 'REQUEST_METRICS', {})
+        if not options.get('ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.budgets = options.get('QUERY_BUDGETS', {})
+        self.budget_action = options.get('BUDGET_ACTION', 'warn')
+        self.server_timing = options.get('SERVER_TIMING', True)
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = activate_metrics(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(metrics.queries))
+                response = self.get_response(request)
+            finished = time.perf_counter()
+        finally:
+            deactivate_metrics(token)
+        total = finished - start
+
+        view_started = getattr(request, '_view_started', None)
+        if view_started is not None:
+            metrics.durations['view'] = finished - view_started
+
+        if self.server_timing:
+            response['Server-Timing'] = self.format_server_timing(metrics, total)
+        self.report(request, response, metrics, total)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._view_started = time.perf_counter()
+
+    def format_server_timing(self, metrics, total):
+        entries = [f'db;dur={metrics.queries.duration * 1000:.2f};desc="{metrics.queries.count} queries"']
+        entries += [f'{name};dur={duration * 1000:.2f}' for name, duration in metrics.durations.items()]
+        entries.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(entries)
+
+    def report(self, request, response, metrics, total):
+        route = request.resolver_match.url_name if request.resolver_match else None
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'route': route,
+            'status': response.status_code,
+            'queries': metrics.queries.count,
+            'sql_ms': round(metrics.queries.duration * 1000, 3),
+            'total_ms': round(total * 1000, 3),
+        }
+        record.update({f'{name}_ms': round(duration * 1000, 3) for name, duration in metrics.durations.items()})
+        logger.info(json.dumps(record), extra={'metrics': record})
+
+        budget = self.budgets.get(route)
+        if budget is not None and metrics.queries.count > budget:
+            message = f"Budget de requêtes SQL dépassé pour {route} : {metrics.queries.count} > {budget}"
+            if self.budget_action == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message, extra={'metrics': record})
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lectures (GET, HEAD, OPTIONS) servies par la réplique (helpers.routing, settings DATABASE_REPLICA),
+    sauf pour l'utilisateur qui a écrit pendant les STICKY_SECONDS précédentes : une écriture réussie
+    (autres méthodes) le maintient sur 'default'. L'utilisateur est désigné par son jeton JWT.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replica_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        user_id = get_token_user_id(request)
+        if request.method not in SAFE_METHODS:
+            return self.mark_writer(user_id, self.get_response(request))
+        with use_replica(self.reads_from_replica(user_id)):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        user_id = get_token_user_id(request)
+        if request.method not in SAFE_METHODS:
+            return self.mark_writer(user_id, await self.get_response(request))
+        with use_replica(self.reads_from_replica(user_id)):
+            return await self.get_response(request)
+
+    def reads_from_replica(self, user_id):
+        return user_id is None or not sticky_writes.is_sticky(user_id)
+
+    def mark_writer(self, user_id, response):
+        if user_id is not None and response.status_code < 400:
+            sticky_writes.mark(user_id)
+        return response
@@ -2,15 +2,26 @@ from django.db import models
 
 
 class TrackingModel(models.Model):
+    # Compteurs incrémentés par des mises à jour F() : jamais réécrits par save() après la création.
+    counter_fields = ()
+
     created_at = models.DateTimeField(
         'Date de création',
         auto_now_add=True
     )
     updated_at = models.DateTimeField(
         'Date de modification',
-        auto_now_add=True
+        auto_now=True
     )
 
     class Meta:
         abstract = True
         ordering = ("-created_at",)
+
+    def save(self, *args, **kwargs):
+        if self.counter_fields and not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
@@ -0,0 +1,158 @@
+import contextvars
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+from helpers.cache import LRUCache
+
+REPLICA_DB_ALIAS = 'replica'
+
+logger = logging.getLogger('database_replica')
+
+_read_from_replica = contextvars.ContextVar('read_from_replica', default=False)
+
+_syncer = None
+_syncer_lock = threading.Lock()
+
+
+def get_replica_options():
+    options = {
+        'ENABLED': False, 'MODE': 'uri', 'NAME': None, 'SYNC_INTERVAL': None,
+        'STICKY_SECONDS': 5, 'MAX_ENTRIES': 10000, 'BACKEND': None,
+    }
+    options.update(getattr(settings, 'DATABASE_REPLICA', {}))
+    return options
+
+
+def replica_enabled():
+    return get_replica_options()['ENABLED'] and REPLICA_DB_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def use_replica(enabled=True):
+    """Autorise (ou interdit) les lectures sur la réplique dans le contexte courant."""
+    token = _read_from_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Lectures vers l'alias 'replica' lorsque le contexte courant l'autorise (use_replica, posé par
+    ReplicaRoutingMiddleware pour les lectures), écritures vers 'default'. Une transaction ouverte
+    sur 'default' y garde les lectures : elles voient les données qu'elle n'a pas encore validées.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _read_from_replica.get() and not connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return REPLICA_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_DB_ALIAS
+
+
+class StickyWrites:
+    """
+    Dernière écriture de chaque utilisateur : ses lectures restent sur 'default' pendant STICKY_SECONDS
+    (il lit ses propres écritures, même si la réplique est en retard). Cache LRU du processus,
+    ou l'alias CACHES désigné par DATABASE_REPLICA['BACKEND'] pour plusieurs processus.
+    """
+
+    def __init__(self, seconds=5, max_entries=10000, backend=None):
+        self.seconds = seconds
+        self.backend = caches[backend] if backend else None
+        self.local = LRUCache(max_entries=max_entries, timeout=seconds)
+
+    @classmethod
+    def from_settings(cls):
+        options = get_replica_options()
+        return cls(seconds=options['STICKY_SECONDS'], max_entries=options['MAX_ENTRIES'], backend=options['BACKEND'])
+
+    @staticmethod
+    def make_key(user_id):
+        return f'sticky:{user_id}'
+
+    def mark(self, user_id):
+        if self.backend is not None:
+            self.backend.set(self.make_key(user_id), True, self.seconds)
+        else:
+            self.local.set(self.make_key(user_id), True)
+
+    def is_sticky(self, user_id):
+        if self.backend is not None:
+            return self.backend.get(self.make_key(user_id), False)
+        return self.local.get(self.make_key(user_id), False)
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+        self.local.clear()
+
+
+sticky_writes = StickyWrites.from_settings()
+
+
+def sync_replica():
+    """
+    Copie la base 'default' dans le fichier de la réplique (DATABASE_REPLICA['NAME'], MODE 'backup')
+    par l'API de sauvegarde SQLite : instantané cohérent, lisible pendant la copie. Retourne la durée.
+    """
+    options = get_replica_options()
+    start = time.perf_counter()
+    source = connections[DEFAULT_DB_ALIAS]
+    source.ensure_connection()
+    destination = sqlite3.connect(options['NAME'], timeout=5)
+    try:
+        source.connection.backup(destination)
+    finally:
+        destination.close()
+    return time.perf_counter() - start
+
+
+class ReplicaSyncer(threading.Thread):
+    """Synchronisation périodique de la réplique dans le processus (DATABASE_REPLICA['SYNC_INTERVAL'])."""
+
+    def __init__(self, interval):
+        super().__init__(name='replica-syncer', daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while True:
+            try:
+                sync_replica()
+            except (DatabaseError, sqlite3.Error):
+                logger.exception("Échec de la synchronisation de la réplique.")
+            if self.stopped.wait(self.interval):
+                break
+
+    def stop(self):
+        self.stopped.set()
+
+
+def start_syncer():
+    """Démarre la synchronisation une seule fois par processus, en MODE 'backup' avec SYNC_INTERVAL défini."""
+    global _syncer
+    options = get_replica_options()
+    if not replica_enabled() or options['MODE'] != 'backup' or not options['SYNC_INTERVAL']:
+        return None
+    with _syncer_lock:
+        if _syncer is None:
+            _syncer = ReplicaSyncer(options['SYNC_INTERVAL'])
+            _syncer.start()
+    return _syncer
@@ -0,0 +1,87 @@
+import functools
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError, connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Profils de PRAGMA appliqués à chaque nouvelle connexion SQLite, choisis par la clé PRAGMAS
+# de DATABASES (nom de profil ou dictionnaire). 'default' conserve le comportement de SQLite (journal DELETE).
+SQLITE_PRAGMA_PROFILES = {
+    'default': {},
+    'wal': {
+        # Lecteurs et écrivain simultanés ; synchronous NORMAL suffit à la durabilité en WAL.
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64000,
+    },
+    'readonly': {
+        'busy_timeout': 5000,
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64000,
+        'query_only': 1,
+    },
+}
+
+
+def get_pragmas(settings_dict):
+    """PRAGMA de l'alias : profil nommé ou dictionnaire {nom: valeur}."""
+    pragmas = settings_dict.get('PRAGMAS') or 'default'
+    if isinstance(pragmas, dict):
+        return pragmas
+    try:
+        return SQLITE_PRAGMA_PROFILES[pragmas]
+    except KeyError:
+        raise ImproperlyConfigured(f"Profil de PRAGMA SQLite inconnu : {pragmas}.")
+
+
+@receiver(connection_created)
+def apply_pragmas(sender, connection, **kwargs):
+    """Applique le profil de PRAGMA de l'alias à la connexion SQLite qui vient d'être ouverte."""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = get_pragmas(connection.settings_dict)
+    if pragmas:
+        with connection.cursor() as cursor:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def is_lock_error(error):
+    return isinstance(error, OperationalError) and ('locked' in str(error) or 'busy' in str(error))
+
+
+def get_retry_options():
+    options = getattr(settings, 'DATABASE_LOCK_RETRY', {})
+    return options.get('ATTEMPTS', 5), options.get('BASE_DELAY', 0.05), options.get('MAX_DELAY', 1.0)
+
+
+def retry_on_lock(func=None, using='default', on_retry=None):
+    """
+    Rejoue `func` lorsque SQLite signale une base verrouillée, avec une attente exponentielle (et aléatoire)
+    entre les essais (settings DATABASE_LOCK_RETRY). `func` doit constituer une transaction complète :
+    aucun nouvel essai à l'intérieur d'un bloc atomic, dont la transaction englobante est déjà compromise.
+    on_retry(essai, erreur) est appelé avant chaque nouvel essai.
+    """
+    if func is None:
+        return functools.partial(retry_on_lock, using=using, on_retry=on_retry)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        attempts, base_delay, max_delay = get_retry_options()
+        for attempt in range(1, attempts + 1):
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as error:
+                if attempt == attempts or not is_lock_error(error) or connections[using].in_atomic_block:
+                    raise
+                if on_retry is not None:
+                    on_retry(attempt, error)
+            time.sleep(min(max_delay, base_delay * 2 ** (attempt - 1)) * random.uniform(0.5, 1))
+
+    return wrapper
@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ProjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'projects'
+
+    def ready(self):
+        from projects import signals  # noqa: F401
+        from projects.search import install_search_triggers
+
+        post_migrate.connect(install_search_triggers, sender=self)
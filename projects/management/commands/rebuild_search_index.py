@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from projects.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruit l'index de recherche plein texte (FTS5) des problèmes et commentaires depuis leurs tables, "
+        "par exemple après des écritures faites sans les triggers (restauration partielle, base copiée)."
+    )
+
+    def handle(self, *args, **options):
+        rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS("Index de recherche reconstruit."))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from projects.models import Issue, Project
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare les compteurs des projets (problèmes, problèmes par statut, contributeurs) et des problèmes "
+        "(commentaires) au nombre de lignes et corrige les écarts par lots, chaque lot dans sa propre transaction ; "
+        "--dry-run les affiche seulement."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help="Affiche les écarts sans les corriger.")
+
+    def handle(self, *args, **options):
+        for model, label in ((Project, 'projets'), (Issue, 'problèmes')):
+            drifted = list(model.drifted().order_by('pk').values_list('pk', 'title'))
+            for pk, title in drifted:
+                self.stdout.write(f"Écart : {title} ({pk})")
+
+            if drifted and not options['dry_run']:
+                ids = [pk for pk, title in drifted]
+                for start in range(0, len(ids), options['batch_size']):
+                    with transaction.atomic():
+                        model.reconcile_counters(*ids[start:start + options['batch_size']])
+
+            action = "à corriger" if options['dry_run'] else "corrigés"
+            self.stdout.write(self.style.SUCCESS(f"{len(drifted)} {label} {action}."))
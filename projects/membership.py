@@ -0,0 +1,221 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router
+from django.db.models import F, FilteredRelation, Q
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+
+from helpers.cache import LRUCache
+from projects.models import Project, Contributor
+
+MISSING = object()
+
+
+class MembershipCache:
+    """
+    Cache des permissions (user_id, project_id) -> 'AUTHOR', 'ASSIGNED' ou None (non contributeur).
+    Utilise un cache LRU du processus, ou l'alias CACHES désigné par MEMBERSHIP_CACHE['BACKEND'].
+    """
+
+    def __init__(self, max_entries=10000, timeout=300, backend=None):
+        self.timeout = timeout
+        self.backend = caches[backend] if backend else None
+        self.local = LRUCache(max_entries=max_entries, timeout=timeout)
+
+    @classmethod
+    def from_settings(cls):
+        options = getattr(settings, 'MEMBERSHIP_CACHE', {})
+        return cls(
+            max_entries=options.get('MAX_ENTRIES', 10000),
+            timeout=options.get('TIMEOUT', 300),
+            backend=options.get('BACKEND'),
+        )
+
+    @staticmethod
+    def make_key(user_id, project_id):
+        return f'membership:{project_id}:{user_id}'
+
+    def get(self, user_id, project_id):
+        key = self.make_key(user_id, project_id)
+        if self.backend is not None:
+            return self.backend.get(key, MISSING)
+        return self.local.get(key, MISSING)
+
+    def set(self, user_id, project_id, permission):
+        key = self.make_key(user_id, project_id)
+        if self.backend is not None:
+            self.backend.set(key, permission, self.timeout)
+        else:
+            self.local.set(key, permission)
+
+    async def aget(self, user_id, project_id):
+        if self.backend is not None:
+            return await self.backend.aget(self.make_key(user_id, project_id), MISSING)
+        return self.get(user_id, project_id)
+
+    async def aset(self, user_id, project_id, permission):
+        if self.backend is not None:
+            await self.backend.aset(self.make_key(user_id, project_id), permission, self.timeout)
+        else:
+            self.set(user_id, project_id, permission)
+
+    def invalidate(self, user_id, project_id):
+        key = self.make_key(user_id, project_id)
+        if self.backend is not None:
+            self.backend.delete(key)
+        else:
+            self.local.delete(key)
+
+    def invalidate_project(self, project_id):
+        """
+        Oublie toutes les entrées du projet. Le backend partagé ne peut pas être parcouru :
+        ses entrées de contributeurs sont invalidées par les signaux de Contributor
+        (suppression en cascade comprise) et les autres expirent avec le TIMEOUT.
+        """
+        prefix = f'membership:{project_id}:'
+        self.local.delete_matching(lambda key: key.startswith(prefix))
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+        self.local.clear()
+
+
+membership_cache = MembershipCache.from_settings()
+
+
+class ProjectMembership:
+    """
+    Appartenance de l'utilisateur connecté à un projet (projet, contributeur et permission).
+    Le projet et le contributeur sont chargés à la demande lorsque la permission provient du cache.
+    """
+
+    def __init__(self, user, project_id, permission, project=None, contributor=None):
+        self.user = user
+        self.project_id = project_id
+        self.permission = permission
+        self._project = project
+        self._contributor = contributor
+
+    @property
+    def project(self):
+        if self._project is None:
+            self._project = get_object_or_404(Project, project_id=self.project_id)
+        return self._project
+
+    @property
+    def contributor(self):
+        if self._contributor is None and self.permission is not None:
+            self._contributor = get_object_or_404(Contributor, user_id=self.user.pk, project_id=self.project_id)
+        return self._contributor
+
+    def is_contributor(self):
+        return self.permission is not None
+
+    def is_author(self):
+        return self.permission == 'AUTHOR'
+
+
+def _contributor_from_row(project, user, values):
+    """Construit le contributeur à partir des colonnes annotées sur le projet (None si absent)."""
+    if values[0] is None:
+        return None
+    field_names = [field.attname for field in Contributor._meta.concrete_fields]
+    contributor = Contributor.from_db(project._state.db, field_names, values)
+    contributor.user_id = user
+    contributor.project_id = project
+    return contributor
+
+
+def membership_queryset(user):
+    """
+    Projets annotés des colonnes de la ligne Contributor de l'utilisateur (jointure externe filtrée),
+    lus sur la base principale : une réplique en retard resterait dans le cache des permissions.
+    """
+    contributor_fields = [field.attname for field in Contributor._meta.concrete_fields]
+    annotations = {f'membership_{name}': F(f'membership__{name}') for name in contributor_fields}
+    user_pk = user.pk if user.is_authenticated else None
+    return (
+        Project.objects
+        .using(router.db_for_write(Project))
+        .annotate(membership=FilteredRelation('contributor', condition=Q(contributor__user_id=user_pk)))
+        .annotate(**annotations)
+    )
+
+
+def load_project_membership(user, project_id):
+    """
+    Charge en une seule requête le projet, la ligne Contributor de l'utilisateur et sa permission.
+    Lève Http404 si le projet n'existe pas.
+    """
+    return _membership_from_project(user, membership_queryset(user).filter(project_id=project_id).first())
+
+
+async def aload_project_membership(user, project_id):
+    """Version asynchrone de load_project_membership (ORM asynchrone)."""
+    return _membership_from_project(user, await membership_queryset(user).filter(project_id=project_id).afirst())
+
+
+def _membership_from_project(user, project):
+    """Construit l'appartenance à partir du projet annoté par membership_queryset (Http404 si absent)."""
+    if project is None:
+        raise Http404("Aucun projet ne correspond à la requête.")
+
+    contributor_fields = [field.attname for field in Contributor._meta.concrete_fields]
+    values = [getattr(project, f'membership_{name}') for name in contributor_fields]
+    contributor = _contributor_from_row(project, user, values)
+    permission = contributor.permission if contributor is not None else None
+    return ProjectMembership(user, project.project_id, permission, project, contributor)
+
+
+def resolve_project_membership(user, project_id):
+    """Retourne l'appartenance au projet depuis le cache des permissions, ou la charge et la met en cache."""
+    if not user.is_authenticated:
+        return load_project_membership(user, project_id)
+
+    permission = membership_cache.get(user.pk, project_id)
+    if permission is not MISSING:
+        return ProjectMembership(user, project_id, permission)
+
+    membership = load_project_membership(user, project_id)
+    membership_cache.set(user.pk, project_id, membership.permission)
+    return membership
+
+
+async def aresolve_project_membership(user, project_id):
+    """Version asynchrone de resolve_project_membership."""
+    if not user.is_authenticated:
+        return await aload_project_membership(user, project_id)
+
+    permission = await membership_cache.aget(user.pk, project_id)
+    if permission is not MISSING:
+        return ProjectMembership(user, project_id, permission)
+
+    membership = await aload_project_membership(user, project_id)
+    await membership_cache.aset(user.pk, project_id, membership.permission)
+    return membership
+
+
+def get_project_membership(request, project_id):
+    """
+    Retourne l'appartenance de l'utilisateur au projet, résolue une seule fois par requête
+    et partagée entre les classes de permission et les vues.
+    """
+    memberships = getattr(request, '_project_memberships', None)
+    if memberships is None:
+        memberships = request._project_memberships = {}
+
+    if project_id not in memberships:
+        memberships[project_id] = resolve_project_membership(request.user, project_id)
+    return memberships[project_id]
+
+
+async def aget_project_membership(request, project_id):
+    """Version asynchrone de get_project_membership, partageant la même résolution par requête."""
+    memberships = getattr(request, '_project_memberships', None)
+    if memberships is None:
+        memberships = request._project_memberships = {}
+
+    if project_id not in memberships:
+        memberships[project_id] = await aresolve_project_membership(request.user, project_id)
+    return memberships[project_id]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2 on 2026-10-18 08:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['issue_id', '-created_at', '-comment_id'], name='comment_issue_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contributor',
+            index=models.Index(fields=['project_id', '-created_at', '-contributor_id'], name='contrib_project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project_id', '-created_at', '-issue_id'], name='issue_project_created_idx'),
+        ),
+    ]
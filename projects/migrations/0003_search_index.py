@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from projects.search import install_search_index, remove_search_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_api_access_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, remove_search_index),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-18 08:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_updated_at_auto_now'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='comments_version',
+            field=models.PositiveBigIntegerField(default=0, editable=False, verbose_name='Version des commentaires '),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0, editable=False, verbose_name='Version des problèmes et contributeurs '),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 4.2 on 2026-10-18 09:13
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_existing_rows(apps, schema_editor):
+    """Initialise les compteurs des projets existants (voir Project.counted_counters)."""
+    Project = apps.get_model('projects', 'Project')
+    Issue = apps.get_model('projects', 'Issue')
+    Contributor = apps.get_model('projects', 'Contributor')
+
+    def count(queryset):
+        queryset = queryset.filter(project_id=OuterRef('pk')).order_by().values('project_id')
+        return Coalesce(Subquery(queryset.annotate(count=Count('*')).values('count')), 0)
+
+    Project.objects.update(
+        issue_count=count(Issue.objects.all()),
+        todo_issue_count=count(Issue.objects.filter(status='TODO')),
+        ongoing_issue_count=count(Issue.objects.filter(status='ONGOING')),
+        ended_issue_count=count(Issue.objects.filter(status='ENDED')),
+        contributor_count=count(Contributor.objects.all()),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_collection_versions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='contributor_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Nombre de contributeurs '),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='ended_issue_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Nombre de problèmes terminés '),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='issue_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Nombre de problèmes '),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='ongoing_issue_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Nombre de problèmes en cours '),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='todo_issue_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Nombre de problèmes à faire '),
+        ),
+        migrations.RunPython(count_existing_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2 on 2026-10-18 09:18
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+
+def count_existing_comments(apps, schema_editor):
+    """Initialise le nombre de commentaires et la dernière activité des problèmes existants."""
+    Issue = apps.get_model('projects', 'Issue')
+    Comment = apps.get_model('projects', 'Comment')
+    comments = Comment.objects.filter(issue_id=OuterRef('pk')).order_by().values('issue_id')
+    Issue.objects.update(
+        comment_count=Coalesce(Subquery(comments.annotate(count=Count('*')).values('count')), 0),
+        last_activity_at=Greatest(
+            'updated_at',
+            Coalesce(Subquery(comments.annotate(last=Max('updated_at')).values('last')), 'updated_at'),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_project_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Nombre de commentaires '),
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='last_activity_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Dernière activité'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project_id', '-last_activity_at', '-issue_id'], name='issue_project_activity_idx'),
+        ),
+        migrations.RunPython(count_existing_comments, migrations.RunPython.noop),
+    ]
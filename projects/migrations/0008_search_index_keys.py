@@ -0,0 +1,16 @@
+from django.db import migrations
+
+from projects.search import install_search_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_issue_activity'),
+    ]
+
+    operations = [
+        # Remplace l'index à contenu externe (associé aux rowid) par des tables FTS5 autonomes
+        # associées aux clés primaires des problèmes et commentaires.
+        migrations.RunPython(install_search_index, migrations.RunPython.noop),
+    ]
@@ -3,6 +3,9 @@ import uuid
 from helpers.validators import ischarfieldvalidator
 from helpers.models import TrackingModel
 from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
 
 
 class Project(TrackingModel):
@@ -37,10 +40,103 @@ class Project(TrackingModel):
         through='Contributor',
         related_name='project_contributors'
     )
+    version = models.PositiveBigIntegerField(
+        'Version des problèmes et contributeurs ',
+        default=0,
+        editable=False
+    )
+    issue_count = models.PositiveIntegerField(
+        'Nombre de problèmes ',
+        default=0,
+        editable=False
+    )
+    todo_issue_count = models.PositiveIntegerField(
+        'Nombre de problèmes à faire ',
+        default=0,
+        editable=False
+    )
+    ongoing_issue_count = models.PositiveIntegerField(
+        'Nombre de problèmes en cours ',
+        default=0,
+        editable=False
+    )
+    ended_issue_count = models.PositiveIntegerField(
+        'Nombre de problèmes terminés ',
+        default=0,
+        editable=False
+    )
+    contributor_count = models.PositiveIntegerField(
+        'Nombre de contributeurs ',
+        default=0,
+        editable=False
+    )
+
+    # Compteur de problèmes par statut (Issue.STATUS).
+    ISSUE_STATUS_COUNTERS = {
+        'TODO': 'todo_issue_count',
+        'ONGOING': 'ongoing_issue_count',
+        'ENDED': 'ended_issue_count',
+    }
+    counter_fields = ('version', 'issue_count', *ISSUE_STATUS_COUNTERS.values(), 'contributor_count')
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def bump_version(cls, *project_ids, touch=False, counters=None):
+        """
+        Incrémente la version des projets en une requête, sans déclencher leurs signaux,
+        et met à jour leur date de modification si touch (liste des contributeurs modifiée).
+        counters : variations des compteurs {champ: delta} appliquées dans la même requête ; un compteur
+        ne descend pas sous zéro (instance périmée), l'écart est corrigé par la commande reconcile_counters.
+        """
+        changes = {'version': F('version') + 1}
+        for name, delta in (counters or {}).items():
+            changes[name] = F(name) + delta if delta > 0 else Greatest(F(name) + delta, 0)
+        if touch:
+            changes['updated_at'] = timezone.now()
+        cls.objects.filter(project_id__in=project_ids).update(**changes)
+
+    @classmethod
+    def issue_counter_changes(cls, added=(), removed=()):
+        """Variations des compteurs de problèmes pour les statuts des problèmes ajoutés et retirés."""
+        changes = {}
+        for statuses, delta in ((added, 1), (removed, -1)):
+            for status in statuses:
+                for name in ('issue_count', cls.ISSUE_STATUS_COUNTERS[status]):
+                    changes[name] = changes.get(name, 0) + delta
+        return {name: delta for name, delta in changes.items() if delta}
+
+    @classmethod
+    def counted_counters(cls):
+        """Valeur recalculée de chaque compteur (sous-requêtes COUNT corrélées au projet)."""
+        def count(queryset):
+            queryset = queryset.filter(project_id=OuterRef('pk')).order_by().values('project_id')
+            return Coalesce(Subquery(queryset.annotate(count=Count('*')).values('count')), 0)
+
+        counters = {
+            'issue_count': count(Issue.objects.all()),
+            'contributor_count': count(Contributor.objects.all()),
+        }
+        for status, name in cls.ISSUE_STATUS_COUNTERS.items():
+            counters[name] = count(Issue.objects.filter(status=status))
+        return counters
+
+    @classmethod
+    def drifted(cls):
+        """Projets dont au moins un compteur diffère du nombre de lignes."""
+        counters = cls.counted_counters()
+        return (
+            cls.objects
+            .annotate(**{f'counted_{name}': value for name, value in counters.items()})
+            .exclude(**{name: F(f'counted_{name}') for name in counters})
+        )
+
+    @classmethod
+    def reconcile_counters(cls, *project_ids):
+        """Recalcule les compteurs des projets en une requête ; retourne le nombre de projets mis à jour."""
+        return cls.objects.filter(project_id__in=project_ids).update(**cls.counted_counters())
+
 
 class Contributor(TrackingModel):
     """Contributeur."""
@@ -75,8 +171,12 @@ class Contributor(TrackingModel):
     )
 
     class Meta:
-        """Interdit le doublon d'assignement d'un utilisateur au projet."""
+        """Interdit le doublon d'assignement d'un utilisateur au projet.
+        Indexe la liste des contributeurs du projet dans l'ordre de pagination."""
         unique_together = ('user_id', 'project_id')
+        indexes = [
+            models.Index(fields=['project_id', '-created_at', '-contributor_id'], name='contrib_project_created_idx'),
+        ]
 
     def __str__(self):
         return f"Contributeur {self.user_id.last_name} {self.user_id.first_name} au projet {self.project_id.title}"
@@ -149,10 +249,74 @@ class Issue(TrackingModel):
         related_name="assigned_user_id",
         verbose_name='utilisateur assigné'
     )
+    comments_version = models.PositiveBigIntegerField(
+        'Version des commentaires ',
+        default=0,
+        editable=False
+    )
+    comment_count = models.PositiveIntegerField(
+        'Nombre de commentaires ',
+        default=0,
+        editable=False
+    )
+    # Date de la dernière écriture du problème ou de l'un de ses commentaires (voir bump_comments_version).
+    last_activity_at = models.DateTimeField(
+        'Dernière activité',
+        auto_now=True
+    )
+
+    counter_fields = ('comments_version', 'comment_count')
+
+    class Meta(TrackingModel.Meta):
+        """Indexe la liste des problèmes du projet dans l'ordre de pagination (création ou dernière activité)."""
+        indexes = [
+            models.Index(fields=['project_id', '-created_at', '-issue_id'], name='issue_project_created_idx'),
+            models.Index(fields=['project_id', '-last_activity_at', '-issue_id'], name='issue_project_activity_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Conserve le statut lu en base (None s'il est différé) pour les compteurs du projet."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    @classmethod
+    def bump_comments_version(cls, *issue_ids, comment_count=0):
+        """
+        Incrémente la version des commentaires des problèmes, ajoute comment_count à leur nombre de commentaires
+        et date leur dernière activité en une requête, sans déclencher leurs signaux. La version de leurs projets
+        est incrémentée (liste des problèmes) par une seconde requête.
+        """
+        changes = {'comments_version': F('comments_version') + 1, 'last_activity_at': timezone.now()}
+        if comment_count > 0:
+            changes['comment_count'] = F('comment_count') + comment_count
+        elif comment_count < 0:
+            changes['comment_count'] = Greatest(F('comment_count') + comment_count, 0)
+        cls.objects.filter(issue_id__in=issue_ids).update(**changes)
+        Project.objects.filter(issue__issue_id__in=issue_ids).update(version=F('version') + 1)
+
+    @classmethod
+    def counted_counters(cls):
+        """Valeur recalculée du nombre de commentaires (sous-requête COUNT corrélée au problème)."""
+        comments = Comment.objects.filter(issue_id=OuterRef('pk')).order_by().values('issue_id')
+        return {'comment_count': Coalesce(Subquery(comments.annotate(count=Count('*')).values('count')), 0)}
+
+    @classmethod
+    def drifted(cls):
+        """Problèmes dont le nombre de commentaires diffère du nombre de lignes."""
+        return cls.objects.alias(counted_comment_count=cls.counted_counters()['comment_count']).exclude(
+            comment_count=F('counted_comment_count')
+        )
+
+    @classmethod
+    def reconcile_counters(cls, *issue_ids):
+        """Recalcule le nombre de commentaires des problèmes en une requête ; retourne le nombre de problèmes."""
+        return cls.objects.filter(issue_id__in=issue_ids).update(**cls.counted_counters())
+
 
 class Comment(TrackingModel):
     """Commentaire."""
@@ -178,6 +342,12 @@ class Comment(TrackingModel):
         verbose_name='problème'
     )
 
+    class Meta(TrackingModel.Meta):
+        """Indexe la liste des commentaires du problème dans l'ordre de pagination."""
+        indexes = [
+            models.Index(fields=['issue_id', '-created_at', '-comment_id'], name='comment_issue_created_idx'),
+        ]
+
     def __str__(self):
         return f"Commentaire de {self.author_user_id.last_name} \
             {self.author_user_id.first_name} au problème {self.issue_id.title}"
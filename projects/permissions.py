@@ -1,19 +1,46 @@
-from django.shortcuts import get_object_or_404
+from django.http import Http404
 from rest_framework import permissions
-from projects.models import Project, Contributor, Comment
+
+from projects.membership import get_project_membership, aget_project_membership
+
+
+def get_contributor_membership(request, view):
+    """Retourne l'appartenance au projet et lève Http404 si l'utilisateur n'en est pas contributeur."""
+    return check_contributor(get_project_membership(request, view.kwargs['project_id']))
+
+
+async def aget_contributor_membership(request, view):
+    """Version asynchrone de get_contributor_membership."""
+    return check_contributor(await aget_project_membership(request, view.kwargs['project_id']))
+
+
+def check_contributor(membership):
+    if not membership.is_contributor():
+        raise Http404("Aucun contributeur ne correspond à la requête.")
+    return membership
+
+
+class IsAuthenticated(permissions.IsAuthenticated):
+    """IsAuthenticated de DRF, utilisable sans thread par les vues asynchrones (aucun accès à la base)."""
+
+    async def ahas_permission(self, request, view):
+        return self.has_permission(request, view)
 
 
 class IsProjectContributor(permissions.BasePermission):
     """Autorise l'accès au contributeur connecté et au super utilisateur uniquement."""
 
     def has_permission(self, request, view):
-        project_id = view.kwargs['project_id']
-        project = get_object_or_404(Project, project_id=project_id)
+        return self.allows(request, get_project_membership(request, view.kwargs['project_id']))
 
+    async def ahas_permission(self, request, view):
+        return self.allows(request, await aget_project_membership(request, view.kwargs['project_id']))
+
+    def allows(self, request, membership):
         if request.user.is_superuser:
             return True
 
-        if (request.user.is_authenticated and request.user.is_contributor(project)):
+        if (request.user.is_authenticated and membership.is_contributor()):
             return True
 
         return False
@@ -24,34 +51,32 @@ class IsProjectAuthorOrReadOnlyContributor(permissions.BasePermission):
     et les SAFE_METHODS ('GET', 'HEAD', 'OPTIONS') au contributeur connecté."""
 
     def has_permission(self, request, view):
-        project_id = view.kwargs['project_id']
-        project = get_object_or_404(Project, project_id=project_id)
-        contributor = get_object_or_404(Contributor, user_id=request.user, project_id=project_id)
+        return self.allows(request, get_contributor_membership(request, view))
 
-        if contributor.is_author():
-            return True
-
-        if request.user.is_contributor(project) and request.method in permissions.SAFE_METHODS:
-            return True
-
-        return False
+    async def ahas_permission(self, request, view):
+        return self.allows(request, await aget_contributor_membership(request, view))
 
     def has_object_permission(self, request, view, obj):
-        project_id = view.kwargs['project_id']
-        project = get_object_or_404(Project, project_id=project_id)
-        contributor = get_object_or_404(Contributor, user_id=request.user, project_id=project_id)
+        return self.allows_object(request, get_contributor_membership(request, view))
 
-        if request.user.is_superuser:
-            return True
+    async def ahas_object_permission(self, request, view, obj):
+        return self.allows_object(request, await aget_contributor_membership(request, view))
 
-        if contributor.is_author():
+    def allows(self, request, membership):
+        if membership.is_author():
             return True
 
-        if request.user.is_contributor(project) and request.method in permissions.SAFE_METHODS:
+        if request.method in permissions.SAFE_METHODS:
             return True
 
         return False
 
+    def allows_object(self, request, membership):
+        if request.user.is_superuser:
+            return True
+
+        return self.allows(request, membership)
+
 
 class IsCommentAuthor(permissions.BasePermission):
     """Autorise la modification et la suppression à l'auteur connecté du commentaire d'un problème
@@ -63,13 +88,16 @@ class IsCommentAuthor(permissions.BasePermission):
         return False
 
     def has_object_permission(self, request, view, obj):
-        comment_id = view.kwargs['comment_id']
-        comment = get_object_or_404(Comment, comment_id=comment_id)
-
         if request.user.is_superuser:
             return True
 
-        if comment.author_user_id == request.user:
+        if obj.author_user_id_id == request.user.pk:
             return True
 
         return False
+
+    async def ahas_permission(self, request, view):
+        return self.has_permission(request, view)
+
+    async def ahas_object_permission(self, request, view, obj):
+        return self.has_object_permission(request, view, obj)
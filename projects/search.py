@@ -0,0 +1,181 @@
+import re
+import uuid
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models.expressions import RawSQL
+
+# Tables FTS5 autonomes : l'index conserve sa propre copie du texte et la clé primaire (UUID) de la ligne
+# indexée (colonne UNINDEXED), les recherches sont jointes sur cette clé. Le rowid FTS est attribué par une table
+# de clés (INTEGER PRIMARY KEY, stable à travers un VACUUM), qui permet aux triggers de retrouver la ligne
+# de l'index par l'UUID sans parcourir la table FTS. Une reconstruction de table par le schema editor SQLite
+# (AddField, AlterField...) supprime les triggers sans toucher à l'index : ils sont recréés à la fin de chaque
+# migrate (install_search_triggers) ; la commande rebuild_search_index reste disponible pour réparer l'index.
+SEARCH_TABLES_SQL = [
+    "CREATE TABLE projects_issue_search_key (id integer NOT NULL PRIMARY KEY, issue_id char(32) NOT NULL UNIQUE)",
+    """CREATE VIRTUAL TABLE projects_issue_fts USING fts5(
+        title, description, issue_id UNINDEXED, tokenize='unicode61 remove_diacritics 2'
+    )""",
+    "CREATE TABLE projects_comment_search_key (id integer NOT NULL PRIMARY KEY, comment_id char(32) NOT NULL UNIQUE)",
+    """CREATE VIRTUAL TABLE projects_comment_fts USING fts5(
+        description, comment_id UNINDEXED, tokenize='unicode61 remove_diacritics 2'
+    )""",
+]
+
+SEARCH_TRIGGERS_SQL = [
+    """CREATE TRIGGER IF NOT EXISTS projects_issue_fts_insert AFTER INSERT ON projects_issue BEGIN
+        INSERT OR IGNORE INTO projects_issue_search_key(issue_id) VALUES (new.issue_id);
+        INSERT OR REPLACE INTO projects_issue_fts(rowid, title, description, issue_id)
+        SELECT id, new.title, new.description, new.issue_id
+        FROM projects_issue_search_key WHERE issue_id = new.issue_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS projects_issue_fts_delete AFTER DELETE ON projects_issue BEGIN
+        DELETE FROM projects_issue_fts
+        WHERE rowid = (SELECT id FROM projects_issue_search_key WHERE issue_id = old.issue_id);
+        DELETE FROM projects_issue_search_key WHERE issue_id = old.issue_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS projects_issue_fts_update AFTER UPDATE OF title, description ON projects_issue
+    BEGIN
+        UPDATE projects_issue_fts SET title = new.title, description = new.description
+        WHERE rowid = (SELECT id FROM projects_issue_search_key WHERE issue_id = new.issue_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS projects_comment_fts_insert AFTER INSERT ON projects_comment BEGIN
+        INSERT OR IGNORE INTO projects_comment_search_key(comment_id) VALUES (new.comment_id);
+        INSERT OR REPLACE INTO projects_comment_fts(rowid, description, comment_id)
+        SELECT id, new.description, new.comment_id
+        FROM projects_comment_search_key WHERE comment_id = new.comment_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS projects_comment_fts_delete AFTER DELETE ON projects_comment BEGIN
+        DELETE FROM projects_comment_fts
+        WHERE rowid = (SELECT id FROM projects_comment_search_key WHERE comment_id = old.comment_id);
+        DELETE FROM projects_comment_search_key WHERE comment_id = old.comment_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS projects_comment_fts_update AFTER UPDATE OF description ON projects_comment
+    BEGIN
+        UPDATE projects_comment_fts SET description = new.description
+        WHERE rowid = (SELECT id FROM projects_comment_search_key WHERE comment_id = new.comment_id);
+    END""",
+]
+
+DROP_SEARCH_INDEX_SQL = [
+    "DROP TRIGGER IF EXISTS projects_issue_fts_insert",
+    "DROP TRIGGER IF EXISTS projects_issue_fts_delete",
+    "DROP TRIGGER IF EXISTS projects_issue_fts_update",
+    "DROP TRIGGER IF EXISTS projects_comment_fts_insert",
+    "DROP TRIGGER IF EXISTS projects_comment_fts_delete",
+    "DROP TRIGGER IF EXISTS projects_comment_fts_update",
+    "DROP TABLE IF EXISTS projects_issue_fts",
+    "DROP TABLE IF EXISTS projects_comment_fts",
+    "DROP TABLE IF EXISTS projects_issue_search_key",
+    "DROP TABLE IF EXISTS projects_comment_search_key",
+]
+
+REBUILD_SEARCH_INDEX_SQL = [
+    "DELETE FROM projects_issue_fts",
+    "DELETE FROM projects_issue_search_key",
+    "INSERT INTO projects_issue_search_key(issue_id) SELECT issue_id FROM projects_issue",
+    """INSERT INTO projects_issue_fts(rowid, title, description, issue_id)
+    SELECT search_key.id, issue.title, issue.description, issue.issue_id
+    FROM projects_issue issue
+    INNER JOIN projects_issue_search_key search_key ON search_key.issue_id = issue.issue_id""",
+    "DELETE FROM projects_comment_fts",
+    "DELETE FROM projects_comment_search_key",
+    "INSERT INTO projects_comment_search_key(comment_id) SELECT comment_id FROM projects_comment",
+    """INSERT INTO projects_comment_fts(rowid, description, comment_id)
+    SELECT search_key.id, comment.description, comment.comment_id
+    FROM projects_comment comment
+    INNER JOIN projects_comment_search_key search_key ON search_key.comment_id = comment.comment_id""",
+]
+
+SNIPPET_START, SNIPPET_END, SNIPPET_ELLIPSIS, SNIPPET_TOKENS = '<mark>', '</mark>', '…', 16
+
+PROJECT_SEARCH_SQL = """
+    SELECT 'issue', issue.issue_id, NULL, issue.title, bm25(projects_issue_fts, 2.0, 1.0) AS rank,
+           snippet(projects_issue_fts, -1, %s, %s, %s, %s)
+    FROM projects_issue_fts
+    INNER JOIN projects_issue issue ON issue.issue_id = projects_issue_fts.issue_id
+    WHERE projects_issue_fts MATCH %s AND issue.project_id_id = %s
+    UNION ALL
+    SELECT 'comment', issue.issue_id, comment.comment_id, issue.title, bm25(projects_comment_fts) AS rank,
+           snippet(projects_comment_fts, 0, %s, %s, %s, %s)
+    FROM projects_comment_fts
+    INNER JOIN projects_comment comment ON comment.comment_id = projects_comment_fts.comment_id
+    INNER JOIN projects_issue issue ON issue.issue_id = comment.issue_id_id
+    WHERE projects_comment_fts MATCH %s AND issue.project_id_id = %s
+    ORDER BY rank
+    LIMIT %s OFFSET %s
+"""
+
+
+def install_search_index(apps, schema_editor):
+    """(Ré)installe les tables FTS5 et leurs triggers puis les remplit depuis les problèmes et commentaires."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_SEARCH_INDEX_SQL + SEARCH_TABLES_SQL + SEARCH_TRIGGERS_SQL + REBUILD_SEARCH_INDEX_SQL:
+        schema_editor.execute(statement, params=None)
+
+
+def install_search_triggers(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Receveur post_migrate : recrée les triggers supprimés par une reconstruction de table pendant les migrations
+    (sans effet s'ils existent ou si l'index n'est pas installé).
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or 'projects_issue_search_key' not in connection.introspection.table_names():
+        return
+    with connection.cursor() as cursor:
+        for statement in SEARCH_TRIGGERS_SQL:
+            cursor.execute(statement)
+
+
+def remove_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_SEARCH_INDEX_SQL:
+        schema_editor.execute(statement, params=None)
+
+
+def rebuild_search_index():
+    with connection.cursor() as cursor:
+        for statement in REBUILD_SEARCH_INDEX_SQL:
+            cursor.execute(statement)
+
+
+def fts_query(text):
+    """
+    Convertit la saisie libre en requête FTS5 : chaque terme est cité (la syntaxe FTS5 de l'utilisateur
+    n'est pas interprétée), tous les termes sont requis et le dernier est recherché comme préfixe.
+    Retourne None si la saisie ne contient aucun terme.
+    """
+    terms = re.findall(r'\w+', text or '')
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"' for term in terms) + '*'
+
+
+def issue_search_filter(query):
+    """Sous-requête des issue_id correspondant à la requête FTS5, utilisable dans filter(issue_id__in=...)."""
+    return RawSQL("SELECT issue_id FROM projects_issue_fts WHERE projects_issue_fts MATCH %s", (query,))
+
+
+def search_project(project_id, query, limit, offset=0):
+    """
+    Recherche les problèmes (titre, description) et commentaires d'un projet, classés par pertinence (bm25).
+    Retourne une liste de dictionnaires avec un extrait dont les termes trouvés sont encadrés de <mark>.
+    """
+    snippet = [SNIPPET_START, SNIPPET_END, SNIPPET_ELLIPSIS, SNIPPET_TOKENS]
+    params = snippet + [query, project_id.hex] + snippet + [query, project_id.hex, limit, offset]
+    with connection.cursor() as cursor:
+        cursor.execute(PROJECT_SEARCH_SQL, params)
+        rows = cursor.fetchall()
+
+    return [
+        {
+            'type': kind,
+            'issue_id': str(uuid.UUID(issue_id)),
+            'comment_id': str(uuid.UUID(comment_id)) if comment_id else None,
+            'issue_title': issue_title,
+            'rank': rank,
+            'snippet': snippet,
+        }
+        for kind, issue_id, comment_id, issue_title, rank, snippet in rows
+    ]
@@ -0,0 +1,89 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from helpers.cache import invalidate_on_commit
+from projects.membership import membership_cache
+from projects.models import Project, Contributor, Issue, Comment
+from projects.stats import stats_cache
+
+
+@receiver([post_save, post_delete], sender=Contributor)
+def invalidate_contributor_membership(sender, instance, **kwargs):
+    """
+    Invalide la permission mise en cache lors de l'ajout, la modification ou le retrait d'un contributeur,
+    de nouveau après la validation de la transaction.
+    """
+    invalidate_on_commit(membership_cache.invalidate, instance.user_id_id, instance.project_id_id)
+
+
+@receiver([post_save, post_delete], sender=Project)
+def invalidate_project_memberships(sender, instance, **kwargs):
+    """Invalide les permissions mises en cache pour le projet créé, modifié ou supprimé (et après validation)."""
+    invalidate_on_commit(membership_cache.invalidate_project, instance.project_id)
+
+
+@receiver([post_save, post_delete], sender=Contributor)
+def bump_contributor_project_version(sender, instance, origin=None, created=False, raw=False, **kwargs):
+    """
+    Versionne et date la modification de la liste des contributeurs sur le projet (validateurs HTTP)
+    et compte le contributeur ajouté ou retiré, dans la même requête.
+    Ignoré lors de la suppression du projet et des suppressions par lot, qui versionnent le projet elles-mêmes.
+    """
+    if isinstance(origin, (Project, QuerySet)):
+        return
+    counters = {}
+    if not raw and (created or kwargs['signal'] is post_delete):
+        counters['contributor_count'] = 1 if created else -1
+    Project.bump_version(instance.project_id_id, touch=True, counters=counters)
+
+
+@receiver(post_save, sender=Issue)
+def bump_issue_project_version(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Versionne la liste des problèmes du projet et met à jour ses compteurs de problèmes
+    (nombre total et par statut) dans la même requête.
+    Un statut modifié dont la valeur lue en base est inconnue (champ différé) est recompté.
+    Pas de receveur post_delete : il empêcherait la suppression rapide des problèmes lors de la suppression
+    du projet ; la vue de suppression d'un problème versionne et compte elle-même (IssueAPIView.perform_destroy),
+    les autres suppressions (utilisateur supprimé) sont corrigées par la commande reconcile_counters.
+    """
+    loaded_status = getattr(instance, '_loaded_status', None)
+    counters, recount = {}, False
+    if raw:
+        pass
+    elif created:
+        counters = Project.issue_counter_changes(added=[instance.status])
+    elif loaded_status is None:
+        recount = True
+    else:
+        counters = Project.issue_counter_changes(added=[instance.status], removed=[loaded_status])
+    Project.bump_version(instance.project_id_id, counters=counters)
+    if recount:
+        Project.reconcile_counters(instance.project_id_id)
+    instance._loaded_status = instance.status
+
+
+@receiver(post_save, sender=Comment)
+def bump_comment_issue_version(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Versionne la liste des commentaires du problème, compte le commentaire ajouté et date
+    la dernière activité du problème (suppression : voir CommentAPIView.perform_destroy).
+    """
+    Issue.bump_comments_version(instance.issue_id_id, comment_count=1 if created and not raw else 0)
+
+
+@receiver(post_save, sender=Issue)
+def invalidate_issue_project_stats(sender, instance, **kwargs):
+    """Invalide les statistiques mises en cache du projet du problème (et après validation)."""
+    invalidate_on_commit(stats_cache.invalidate, instance.project_id_id)
+
+
+@receiver(post_save, sender=Comment)
+def invalidate_comment_project_stats(sender, instance, **kwargs):
+    """Invalide les statistiques mises en cache du projet du commentaire (et après validation)."""
+    if Comment.issue_id.is_cached(instance):
+        project_id = instance.issue_id.project_id_id
+    else:
+        project_id = Issue.objects.filter(pk=instance.issue_id_id).values_list('project_id', flat=True).first()
+    invalidate_on_commit(stats_cache.invalidate, project_id)
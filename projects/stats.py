@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router
+from django.db.models import Count
+
+from helpers.cache import LRUCache
+from projects.models import Issue
+
+# Répartitions des problèmes : clé de la réponse -> champ de Issue.
+BREAKDOWNS = {
+    'status': 'status',
+    'priority': 'priority',
+    'tag': 'tag',
+    'assignee': 'assigned_user_id',
+}
+
+
+class ProjectStatsCache:
+    """
+    Cache des statistiques par projet, invalidé à l'écriture d'un problème ou d'un commentaire
+    (projects.signals). Utilise un cache LRU du processus, ou l'alias CACHES désigné par
+    PROJECT_STATS_CACHE['BACKEND'].
+    """
+
+    def __init__(self, max_entries=1000, timeout=300, backend=None):
+        self.timeout = timeout
+        self.backend = caches[backend] if backend else None
+        self.local = LRUCache(max_entries=max_entries, timeout=timeout)
+
+    @classmethod
+    def from_settings(cls):
+        options = getattr(settings, 'PROJECT_STATS_CACHE', {})
+        return cls(
+            max_entries=options.get('MAX_ENTRIES', 1000),
+            timeout=options.get('TIMEOUT', 300),
+            backend=options.get('BACKEND'),
+        )
+
+    @staticmethod
+    def make_key(project_id):
+        return f'stats:{project_id}'
+
+    def get(self, project_id):
+        if self.backend is not None:
+            return self.backend.get(self.make_key(project_id))
+        return self.local.get(self.make_key(project_id))
+
+    def set(self, project_id, stats):
+        if self.backend is not None:
+            self.backend.set(self.make_key(project_id), stats, self.timeout)
+        else:
+            self.local.set(self.make_key(project_id), stats)
+
+    def invalidate(self, project_id):
+        if self.backend is not None:
+            self.backend.delete(self.make_key(project_id))
+        else:
+            self.local.delete(self.make_key(project_id))
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+        self.local.clear()
+
+
+stats_cache = ProjectStatsCache.from_settings()
+
+
+def stats_queryset(project_id):
+    """
+    Une seule requête groupée : nombre de problèmes et de commentaires par combinaison
+    (statut, priorité, balise, assigné), lue sur la base principale (le résultat est mis en cache).
+    """
+    return (
+        Issue.objects
+        .using(router.db_for_write(Issue))
+        .filter(project_id=project_id)
+        .order_by()
+        .values(*BREAKDOWNS.values())
+        .annotate(issues=Count('pk', distinct=True), comments=Count('comment_issue_id'))
+    )
+
+
+def compute_project_stats(project_id):
+    """Nombre de problèmes et de commentaires du projet, au total et par statut, priorité, balise et assigné."""
+    stats = {'issue_count': 0, 'comment_count': 0}
+    for name, field in BREAKDOWNS.items():
+        choices = Issue._meta.get_field(field).choices or ()
+        stats[name] = {value: {'issues': 0, 'comments': 0} for value, label in choices}
+
+    for row in stats_queryset(project_id):
+        stats['issue_count'] += row['issues']
+        stats['comment_count'] += row['comments']
+        for name, field in BREAKDOWNS.items():
+            counts = stats[name].setdefault(str(row[field]), {'issues': 0, 'comments': 0})
+            counts['issues'] += row['issues']
+            counts['comments'] += row['comments']
+    return stats
+
+
+def get_project_stats(project_id):
+    """Statistiques du projet depuis le cache, ou calculées puis mises en cache."""
+    stats = stats_cache.get(project_id)
+    if stats is None:
+        stats = compute_project_stats(project_id)
+        stats_cache.set(project_id, stats)
+    return stats